@@ -136,6 +136,24 @@ async function migrateSQLite() {
       computed_at TEXT NOT NULL DEFAULT (datetime('now')),
       UNIQUE(period_type, period_start, survey_id)
     )`,
+    `CREATE TABLE IF NOT EXISTS kpi_cache_batches (
+      batch_id TEXT NOT NULL,
+      period_type TEXT NOT NULL CHECK (period_type IN ('daily', 'weekly', 'monthly', 'all_time')),
+      period_start TEXT NOT NULL,
+      period_end TEXT NOT NULL,
+      survey_id TEXT REFERENCES surveys(id) ON DELETE CASCADE,
+      total INTEGER NOT NULL,
+      valid INTEGER NOT NULL,
+      completeness_sum REAL NOT NULL,
+      compliance_sum REAL NOT NULL,
+      images INTEGER NOT NULL,
+      videos INTEGER NOT NULL,
+      with_media INTEGER NOT NULL,
+      categories TEXT NOT NULL DEFAULT '{}',
+      agents TEXT NOT NULL DEFAULT '{}',
+      statuses TEXT NOT NULL DEFAULT '{}',
+      computed_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )`,
   ];
 
   const indexes = [
@@ -145,6 +163,8 @@ async function migrateSQLite() {
     `CREATE INDEX IF NOT EXISTS idx_responses_agent ON survey_responses(surveyor_username)`,
     `CREATE INDEX IF NOT EXISTS idx_media_response_id ON media_attachments(response_id)`,
     `CREATE INDEX IF NOT EXISTS idx_media_category ON media_attachments(media_category)`,
+    `CREATE INDEX IF NOT EXISTS idx_kpi_cache_batches_batch ON kpi_cache_batches(batch_id)`,
+    `CREATE INDEX IF NOT EXISTS idx_kpi_cache_batches_period ON kpi_cache_batches(period_type, period_start)`,
   ];
 
   for (const sql of [...tables, ...indexes]) {
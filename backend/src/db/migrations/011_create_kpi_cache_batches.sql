@@ -0,0 +1,26 @@
+-- Per-delivery-batch sums behind kpi_cache (written by scripts/kpi_rollups.py).
+-- kpi_cache rows are rebuilt as the sum of every batch's rows for the period.
+CREATE TABLE kpi_cache_batches (
+    batch_id          VARCHAR(64) NOT NULL,
+    period_type       VARCHAR(10) NOT NULL
+        CHECK (period_type IN ('daily', 'weekly', 'monthly', 'all_time')),
+    period_start      DATE NOT NULL,
+    period_end        DATE NOT NULL,
+    survey_id         UUID REFERENCES surveys(id) ON DELETE CASCADE,
+
+    total             INTEGER NOT NULL,
+    valid             INTEGER NOT NULL,
+    completeness_sum  DOUBLE PRECISION NOT NULL,
+    compliance_sum    DOUBLE PRECISION NOT NULL,
+    images            INTEGER NOT NULL,
+    videos            INTEGER NOT NULL,
+    with_media        INTEGER NOT NULL,
+    categories        JSONB NOT NULL DEFAULT '{}',
+    agents            JSONB NOT NULL DEFAULT '{}',
+    statuses          JSONB NOT NULL DEFAULT '{}',
+
+    computed_at       TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_kpi_cache_batches_batch ON kpi_cache_batches(batch_id);
+CREATE INDEX idx_kpi_cache_batches_period ON kpi_cache_batches(period_type, period_start);
@@ -0,0 +1,154 @@
+"""
+Run Checkpoints
+================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Periodic checkpoints for long validation / delivery runs. A checkpoint
+records, at a record boundary:
+
+    - the next input record index
+    - the byte length of every partial output file
+    - the byte length of the per-record spill file (validation results etc.)
+    - the random state used for QA sampling
+
+On resume, partial outputs and the spill are truncated back to the last
+checkpoint, the spilled records are reloaded, and processing continues
+from the recorded index, so the final outputs match an uninterrupted run.
+"""
+
+import json
+import os
+import random
+import shutil
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 10000  # records
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint cannot be resumed."""
+
+
+def input_fingerprint(paths: list, **options) -> dict:
+    """Identify a run by its input files (path, size, mtime) and options."""
+    inputs = []
+    for path in paths:
+        st = os.stat(path)
+        inputs.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    return {'inputs': inputs, 'options': options}
+
+
+class RunCheckpoint:
+    """
+    Checkpoint state kept in `directory`. `every` is the number of records
+    between checkpoints; 0 disables checkpointing.
+    """
+
+    STATE_FILE = 'state.json'
+    SPILL_FILE = 'records.ndjson'
+
+    def __init__(self, directory: str, fingerprint: dict, every: int = DEFAULT_CHECKPOINT_EVERY):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.every = every
+        self.spilled = []
+        self.state = None
+        self._spill = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.every > 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def begin(self, resume: bool, outputs: dict) -> dict:
+        """
+        Start or resume a run. `outputs` maps names to partial output paths.
+        Returns the state; state['next_index'] is the first record to process
+        and state['offsets'][name] the byte length to continue each output from.
+        """
+        state = self._load() if resume else None
+        if state is None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            state = {
+                'version': CHECKPOINT_VERSION,
+                'fingerprint': self.fingerprint,
+                'next_index': 0,
+                'offsets': {name: 0 for name in outputs},
+                'spill_bytes': 0,
+                'random_state': _dump_random_state(random.getstate()),
+            }
+        else:
+            for name, path in outputs.items():
+                os.truncate(path, state['offsets'][name])
+            random.setstate(_load_random_state(state['random_state']))
+
+        # reloaded even when checkpointing is now off, since next_index skips these records
+        spill_path = self._path(self.SPILL_FILE)
+        if state['spill_bytes']:
+            os.truncate(spill_path, state['spill_bytes'])
+            with open(spill_path, 'r', encoding='utf-8') as f:
+                self.spilled = [json.loads(line) for line in f]
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+            self._spill = open(spill_path, 'a' if state['spill_bytes'] else 'w', encoding='utf-8')
+        self.state = state
+        return state
+
+    def _load(self):
+        try:
+            with open(self._path(self.STATE_FILE), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise CheckpointError('checkpoint was written by an incompatible version')
+        if state['fingerprint'] != self.fingerprint:
+            raise CheckpointError('input files or options changed since the checkpoint was written')
+        return state
+
+    def append(self, record: dict):
+        """Spill one per-record entry; reloaded into `spilled` on resume."""
+        if self._spill is not None:
+            self._spill.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def due(self, next_index: int) -> bool:
+        return self.enabled and next_index % self.every == 0
+
+    def save(self, next_index: int, files: dict):
+        """
+        Durably record a checkpoint at `next_index`. `files` maps output
+        names to open file objects, which are flushed and synced first.
+        """
+        if not self.enabled:
+            return
+        for f in (*files.values(), self._spill):
+            f.flush()
+            os.fsync(f.fileno())
+        self.state['next_index'] = next_index
+        self.state['offsets'] = {name: f.tell() for name, f in files.items()}
+        self.state['spill_bytes'] = self._spill.tell()
+        tmp = self._path(self.STATE_FILE + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path(self.STATE_FILE))
+
+    def finish(self):
+        """Remove checkpoint state after a completed run."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _dump_random_state(state) -> list:
+    version, internal, gauss = state
+    return [version, list(internal), gauss]
+
+
+def _load_random_state(state: list) -> tuple:
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
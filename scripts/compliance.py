@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+NAVER POI Compliance Scoring Engine
+====================================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Batch port of backend/src/utils/calculateCompliance (utils/compliance.js).
+Field weights, mandatory flags and category groups are read from the
+backend's single source of truth, backend/src/config/field-mappings.js,
+so delivery reports and the portal score records identically:
+
+    score          = earnedSAR / applicableSAR * 100   (2 decimals)
+    earnedSAR      = SAR weight of filled applicable fields
+    applicableSAR  = SAR weight of all applicable fields
+    missingFields  = mandatory applicable fields that are empty
+
+Records are scored in bulk: per category group the applicable fields are
+precomputed once, each record is reduced to a fill bitmask, and results
+are computed once per distinct (group, media availability, mask).
+
+Usage:
+    python compliance.py --input data.json --output compliance_scores.json
+    python compliance.py --input records.json --local   # backend column names
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from decimal import Decimal, ROUND_HALF_UP
+
+FIELD_MAPPINGS_JS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', 'backend', 'src', 'config', 'field-mappings.js',
+)
+
+CATEGORY_GROUPS = ('restaurants_cafes', 'attraction_landmark', 'mosque', 'other')
+_GROUP_SETS = {
+    'restaurants_cafes': 'RESTAURANT_CAFE_CODES',
+    'attraction_landmark': 'ATTRACTION_LANDMARK_CODES',
+    'mosque': 'MOSQUE_CODES',
+}
+
+# Delivery field names that differ from both the backend column and the
+# ArcGIS name in FIELD_DEFINITIONS.
+DELIVERY_ALIASES = {
+    'working_hours': 'working_hours',
+    'break_times': 'break_time',
+    'languages_spoken': 'language',
+    'reservation_available': 'reservation',
+    'wheelchair_accessible': 'is_wheelchair_accessible',
+    'family_seating': 'has_family_seating',
+    'private_rooms': 'has_separate_rooms_for_dining',
+    'large_groups': 'large_groups_can_be_seated',
+    'smoking_area': 'has_smoking_area',
+    'waiting_area': 'has_a_waiting_area',
+    'women_prayer_room': 'has_women_only_prayer_room',
+    'shisha_available': 'shisha',
+    'live_sports': 'live_sport_broadcasting',
+    'iftar_menu': 'offers_iftar_menu',
+    'open_suhoor': 'is_open_during_suhoor',
+    'iftar_tent': 'provides_iftar_tent',
+    'free_entry': 'is_free_entry',
+}
+SOCIAL_MEDIA_FIELDS = ['instagram', 'tiktok', 'x_account', 'snapchat']
+IMAGE_URL_FIELDS = ['exterior_image_url', 'interior_image_url', 'entrance_image_url', 'menu_image_url']
+VIDEO_URL_FIELDS = ['walkthrough_video_url']
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIELD MAPPINGS (parsed from the backend JS module)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _js_literal(text: str):
+    """Decode a JS array/object literal of plain strings, numbers and booleans."""
+    text = re.sub(r'//[^\n]*', '', text)
+    text = re.sub(r"'([^'\\]*)'", lambda m: json.dumps(m.group(1)), text)
+    text = re.sub(r'([{,]\s*)([A-Za-z_]\w*)\s*:', r'\1"\2":', text)
+    text = re.sub(r',(\s*[\]}])', r'\1', text)
+    return json.loads(text)
+
+
+def load_field_mappings(path: str = FIELD_MAPPINGS_JS) -> dict:
+    """
+    Read FIELD_DEFINITIONS, COMPLIANCE_FIELDS and the category code sets
+    from field-mappings.js.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    def array(name, pattern=r'const {}\s*=\s*(\[.*?\n\]);'):
+        m = re.search(pattern.format(name), source, re.S)
+        if not m:
+            raise ValueError(f'{name} not found in {path}')
+        return _js_literal(m.group(1))
+
+    return {
+        'field_definitions': array('FIELD_DEFINITIONS'),
+        'compliance_fields': array('COMPLIANCE_FIELDS'),
+        'category_codes': {
+            group: set(array(name, r'const {}\s*=\s*new Set\((\[.*?\])\)'))
+            for group, name in _GROUP_SETS.items()
+        },
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# JS SEMANTICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def js_is_filled(value) -> bool:
+    """Python equivalent of field-normalization.js isFilled()."""
+    if value is None:
+        return False
+    if isinstance(value, list):
+        return len(value) > 0
+    if isinstance(value, (bool, int, float, dict)):
+        return True
+    s = str(value).strip()
+    return s != '' and s.upper() != 'N/A'
+
+
+def js_to_fixed(value: float, digits: int = 2) -> float:
+    """Number(x.toFixed(digits)): round the exact double half-up."""
+    quantum = Decimal(1).scaleb(-digits)
+    return float(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def _present(count) -> bool:
+    return count is not None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ComplianceEngine:
+    """Batch scorer equivalent to calculateCompliance() in compliance.js."""
+
+    def __init__(self, mappings: dict = None):
+        mappings = mappings or load_field_mappings()
+        self.category_codes = mappings['category_codes']
+        self.arcgis_to_local = {d['arcgis']: d['local'] for d in mappings['field_definitions']}
+        self.plans = {}
+        for group in CATEGORY_GROUPS:
+            self.plans[group] = [
+                f for f in mappings['compliance_fields']
+                if 'all' in f['categories'] or group in f['categories']
+            ]
+        self._memo = {}
+
+    def category_group(self, category) -> str:
+        """getCategoryGroup() from field-mappings.js."""
+        if not category:
+            return 'other'
+        code = str(category).strip().lower()
+        for group, codes in self.category_codes.items():
+            if code in codes:
+                return group
+        return 'other'
+
+    def _fill_mask(self, fields: list, record: dict, image_count, video_count) -> int:
+        mask = 0
+        for bit, field in enumerate(fields):
+            ftype = field.get('type')
+            local = field['local']
+            if ftype == 'coordinates':
+                filled = js_is_filled(record.get('latitude')) and js_is_filled(record.get('longitude'))
+            elif ftype in ('media_image', 'media'):
+                if local == '_business_exterior':
+                    filled = image_count is not None and image_count >= 1
+                elif local == '_business_interior':
+                    filled = image_count is not None and image_count >= 2
+                else:
+                    filled = False
+            elif ftype == 'media_video':
+                filled = local == '_interior_video' and video_count is not None and video_count >= 1
+            elif local == 'entrance_description':
+                filled = (js_is_filled(record.get('entrance_description'))
+                          or js_is_filled(record.get('entrance_location')))
+            else:
+                filled = js_is_filled(record.get(local))
+            if filled:
+                mask |= 1 << bit
+        return mask
+
+    def _evaluate(self, group: str, images_known: bool, videos_known: bool, mask: int) -> dict:
+        key = (group, images_known, videos_known, mask)
+        result = self._memo.get(key)
+        if result is not None:
+            return result
+        total = filled = 0
+        earned = applicable = 0.0
+        missing = []
+        for bit, field in enumerate(self.plans[group]):
+            ftype = field.get('type')
+            if ftype in ('media_image', 'media') and not images_known:
+                continue
+            if ftype == 'media_video' and not videos_known:
+                continue
+            weight = field.get('weight') or 0
+            total += 1
+            applicable += weight
+            if mask >> bit & 1:
+                filled += 1
+                earned += weight
+            elif field.get('mandatory'):
+                missing.append(field['local'])
+        result = self._memo[key] = {
+            'score': 0 if applicable == 0 else js_to_fixed(earned / applicable * 100),
+            'isComplete': not missing,
+            'totalFields': total,
+            'filledFields': filled,
+            'missingFields': missing,
+            'earnedSAR': js_to_fixed(earned),
+            'applicableSAR': js_to_fixed(applicable),
+        }
+        return result
+
+    def score(self, record: dict, category=None, image_count=None,
+              video_count=None, media_count=None) -> dict:
+        """Score one record keyed by backend column names."""
+        group = self.category_group(category or record.get('category') or '')
+        effective_images = image_count if image_count is not None else media_count
+        images_known = _present(effective_images)
+        videos_known = _present(video_count) or _present(media_count)
+        mask = self._fill_mask(self.plans[group], record, effective_images, video_count)
+        result = self._evaluate(group, images_known, videos_known, mask)
+        return {**result, 'missingFields': list(result['missingFields'])}
+
+    def score_batch(self, records: list, media: list = None) -> list:
+        """
+        Score many records. `media` optionally gives one dict per record
+        with imageCount / videoCount / mediaCount, as in the JS options.
+        """
+        media = media or [{}] * len(records)
+        return [
+            self.score(record, opts.get('category'), opts.get('imageCount'),
+                       opts.get('videoCount'), opts.get('mediaCount'))
+            for record, opts in zip(records, media)
+        ]
+
+    # ─── Delivery records ────────────────────────────────────────────────
+
+    def delivery_to_local(self, poi: dict) -> dict:
+        """Map a delivery POI (schema field names) onto backend column names."""
+        record = {}
+        for name, value in poi.items():
+            local = DELIVERY_ALIASES.get(name) or self.arcgis_to_local.get(name) or name
+            record[local] = value
+        social = [str(poi[f]).strip() for f in SOCIAL_MEDIA_FIELDS if js_is_filled(poi.get(f))]
+        if social:
+            record['social_media'] = ','.join(social)
+        return record
+
+    def score_pois(self, pois: list) -> list:
+        """Score delivery POIs, counting filled image / video URLs as attachments."""
+        records, media = [], []
+        for poi in pois:
+            records.append(self.delivery_to_local(poi))
+            media.append({
+                'imageCount': sum(1 for f in IMAGE_URL_FIELDS if js_is_filled(poi.get(f))),
+                'videoCount': sum(1 for f in VIDEO_URL_FIELDS if js_is_filled(poi.get(f))),
+            })
+        return self.score_batch(records, media)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description='NAVER POI Compliance Scoring')
+    parser.add_argument('--input', '-i', required=True, help='Input data file (JSON or CSV)')
+    parser.add_argument('--output', '-o', default=None, help='Output JSON file (stdout if omitted)')
+    parser.add_argument('--local', action='store_true',
+                        help='Input is a JSON list of {"record": {...}, "options": {...}} '
+                             'keyed by backend column names, as passed to calculateCompliance')
+    parser.add_argument('--mappings', default=FIELD_MAPPINGS_JS, help='Path to field-mappings.js')
+    args = parser.parse_args()
+
+    engine = ComplianceEngine(load_field_mappings(args.mappings))
+    if args.local:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            cases = json.load(f)
+        scores = engine.score_batch([c['record'] for c in cases],
+                                    [c.get('options') or {} for c in cases])
+    else:
+        from validate import load_file
+        scores = engine.score_pois(load_file(args.input))
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    json.dump(scores, out, indent=2, ensure_ascii=False)
+    out.write('\n')
+    if args.output:
+        out.close()
+
+
+if __name__ == '__main__':
+    main()
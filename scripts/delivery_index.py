@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+NAVER Delivery Record Index
+============================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Sidecar offset index over a delivery export. Each entry maps a POI
+global_id to the byte offset and byte length of its record inside the
+export, so a single record can be decoded without parsing the whole file.
+
+Index file layout (little-endian):
+    header   8s magic | Q entry count
+    entries  16s key  | Q byte offset | I byte length   (sorted by key)
+
+Keys are the 16 raw bytes of the UUID for valid global_ids, and a 16-byte
+BLAKE2b digest of the string otherwise.
+
+Usage:
+    python delivery_index.py --export json/naver_poi_delivery.json <global_id> [...]
+    python delivery_index.py --export json/naver_poi_delivery.json --ids-file ids.txt
+    python delivery_index.py --export json/naver_poi_delivery.ndjson <global_id>
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import uuid
+
+INDEX_MAGIC = b'POIIDX01'
+INDEX_HEADER = struct.Struct('<8sQ')
+INDEX_ENTRY = struct.Struct('<16sQI')
+
+
+def global_id_key(global_id) -> bytes:
+    """Return the 16-byte index key for a global_id."""
+    text = str(global_id).strip()
+    try:
+        return uuid.UUID(text).bytes
+    except ValueError:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def index_path_for(export_path: str) -> str:
+    """Default sidecar index path for an export file."""
+    return os.path.splitext(export_path)[0] + '.idx'
+
+
+def write_index(entries, output_path: str) -> int:
+    """
+    Write a sorted offset index.
+    `entries` is an iterable of (global_id, byte_offset, byte_length);
+    records without a global_id are skipped. Returns the entry count.
+    """
+    packed = sorted(
+        (global_id_key(gid), offset, length)
+        for gid, offset, length in entries
+        if gid is not None and str(gid).strip()
+    )
+    with open(output_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(packed)))
+        for key, offset, length in packed:
+            f.write(INDEX_ENTRY.pack(key, offset, length))
+    return len(packed)
+
+
+class DeliveryIndex:
+    """Memory-mapped view over an export and its sidecar index."""
+
+    def __init__(self, export_path: str, index_path: str = None):
+        index_path = index_path or index_path_for(export_path)
+        self._files = []
+        self._export = self._index = None
+        try:
+            self._export = self._map(export_path)
+            self._index = self._map(index_path)
+            magic, self.count = INDEX_HEADER.unpack_from(self._index, 0)
+            if magic != INDEX_MAGIC:
+                raise ValueError(f'not a delivery index: {index_path}')
+            expected = INDEX_HEADER.size + self.count * INDEX_ENTRY.size
+            if len(self._index) != expected:
+                raise ValueError(f'truncated delivery index: {index_path}')
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path: str) -> mmap.mmap:
+        f = open(path, 'rb')
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for m in ('_export', '_index'):
+            if getattr(self, m, None) is not None:
+                getattr(self, m).close()
+                setattr(self, m, None)
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def _key_at(self, i: int) -> bytes:
+        return self._index[INDEX_HEADER.size + i * INDEX_ENTRY.size:
+                           INDEX_HEADER.size + i * INDEX_ENTRY.size + 16]
+
+    def _locate(self, key: bytes) -> list:
+        """Return (offset, length) of every entry matching `key`."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        spans = []
+        while lo < self.count:
+            k, offset, length = INDEX_ENTRY.unpack_from(
+                self._index, INDEX_HEADER.size + lo * INDEX_ENTRY.size)
+            if k != key:
+                break
+            spans.append((offset, length))
+            lo += 1
+        return spans
+
+    def _decode(self, key: bytes, offset: int, length: int) -> dict:
+        record = json.loads(self._export[offset:offset + length].decode('utf-8'))
+        if not isinstance(record, dict) or global_id_key(record.get('global_id')) != key:
+            raise ValueError(f'index out of date with export at byte offset {offset}')
+        return record
+
+    def lookup(self, global_id) -> list:
+        """Return every record delivered under `global_id` (usually one)."""
+        key = global_id_key(global_id)
+        return [self._decode(key, o, n) for o, n in self._locate(key)]
+
+    def lookup_many(self, global_ids) -> dict:
+        """
+        Batch lookup. Probes the index in key order and decodes records in
+        file order. Returns {global_id: [records]}; misses map to [].
+        """
+        keyed = sorted((global_id_key(g), g) for g in dict.fromkeys(global_ids))
+        hits = []
+        found = {g: [] for _, g in keyed}
+        for key, gid in keyed:
+            for offset, length in self._locate(key):
+                hits.append((offset, length, key, gid))
+        for offset, length, key, gid in sorted(hits):
+            found[gid].append(self._decode(key, offset, length))
+        return found
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description='NAVER Delivery Record Lookup')
+    parser.add_argument('ids', nargs='*', help='global_id values to look up')
+    parser.add_argument('--export', '-e', required=True, help='Delivery export file (JSON or NDJSON)')
+    parser.add_argument('--index', default=None, help='Sidecar index (defaults to <export>.idx)')
+    parser.add_argument('--ids-file', default=None, help='File with one global_id per line')
+    args = parser.parse_args()
+
+    ids = list(args.ids)
+    if args.ids_file:
+        with open(args.ids_file, 'r', encoding='utf-8') as f:
+            ids.extend(line.strip() for line in f if line.strip())
+    if not ids:
+        parser.error('no global_id given')
+
+    with DeliveryIndex(args.export, args.index) as index:
+        found = index.lookup_many(ids)
+
+    missing = [gid for gid in ids if not found[gid]]
+    records = [rec for gid in dict.fromkeys(ids) for rec in found[gid]]
+    json.dump(records, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write('\n')
+    for gid in missing:
+        print(f'NOT FOUND: {gid}', file=sys.stderr)
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,33 +7,58 @@ Farq Technology Establishment — NAVER Cloud Corporation
 Generates the complete delivery package structure:
   /NAVER_PILOT_DELIVERY
     /csv           - POI data in CSV format
-    /json          - POI data in JSON format
-    /media         - Media assets
+    /json          - POI data in JSON or NDJSON format (+ optional .idx record index)
+    /media         - Media assets (--media) + media_manifest.json
+    /tiles         - Map/KPI tile aggregates (optional, --tiles)
     validation_report.json
     kpi_summary.json
     completeness_report.csv
     billing_summary.json
     data_dictionary.xlsx (as JSON fallback)
     compliance_statement.txt
+    duplicates_report.json (only when duplicate global_ids were merged)
+
+With --registry, POIs whose global_id was delivered in an earlier batch are
+reported (validation report, billing_summary.json 'unbillable') but left out
+of /csv, /json and /media, so nothing is shipped twice.
 
 Usage:
     python generate_delivery.py --input data.json --output ./NAVER_PILOT_DELIVERY
+    python generate_delivery.py --input data.json --output ./NAVER_PILOT_DELIVERY --index
+    python generate_delivery.py --input data.ndjson --output ./NAVER_PILOT_DELIVERY --json-format ndjson
+    python generate_delivery.py --input data.json --output ./NAVER_PILOT_DELIVERY --resume
+    python generate_delivery.py --input data.json --output ./NAVER_PILOT_DELIVERY --media --media-root ./photos
+    python generate_delivery.py --input data.json --output ./NAVER_PILOT_DELIVERY --registry delivered_ids.reg
+    python generate_delivery.py --input field_teams/ --output ./NAVER_PILOT_DELIVERY --dedup last-wins
 """
 
 import argparse
 import csv
 import json
 import os
+import random
 import sys
 from datetime import datetime, timezone
 
 # Import validation engine
 sys.path.insert(0, os.path.dirname(__file__))
 from validate import (
-    load_json, load_csv, validate_poi, generate_validation_report,
+    expand_inputs, load_inputs, merge_pois, validate_poi, previously_delivered, flag_previously_delivered,
+    apply_compliance_scores,
+    generate_validation_report,
     generate_completeness_csv, qa_sample_and_calculate_kpi,
-    calculate_billing, ALL_FIELDS, BOOLEAN_FIELDS, REQUIRED_FIELDS,
+    calculate_billing, ALL_FIELDS, BOOLEAN_FIELDS, REQUIRED_FIELDS, DEDUP_POLICIES, INPUT_FORMATS,
+    PREVIOUSLY_DELIVERED,
+)
+from media_package import DEFAULT_MEDIA_WORKERS, package_media
+from ndjson_io import JSON_ENCODERS, get_encoder, resolve_encoder
+from delivery_index import index_path_for, write_index
+from id_registry import IdRegistry
+from checkpoint import (
+    CheckpointError, RunCheckpoint, DEFAULT_CHECKPOINT_EVERY, input_fingerprint,
 )
+from qa_probability import DEFAULT_QA_TRIALS
+from tile_aggregates import aggregate_tiles, write_tile_aggregates
 
 
 def poi_to_csv_row(poi: dict) -> dict:
@@ -54,31 +79,116 @@ def poi_to_csv_row(poi: dict) -> dict:
     return row
 
 
+class CsvExportWriter:
+    """Incremental CSV export writer (UTF-8). Continues a partial file at `resume_offset`."""
+
+    def __init__(self, output_path: str, resume_offset: int = 0):
+        self.file = open(output_path, 'a' if resume_offset else 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self.file, fieldnames=ALL_FIELDS)
+        if not resume_offset:
+            self._writer.writeheader()
+
+    def write(self, poi: dict):
+        self._writer.writerow(poi_to_csv_row(poi))
+
+    def close(self):
+        self.file.close()
+
+
 def generate_csv_export(pois: list, output_path: str):
     """Export POIs to CSV (UTF-8)."""
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=ALL_FIELDS)
-        writer.writeheader()
-        for poi in pois:
-            writer.writerow(poi_to_csv_row(poi))
-
-
-def generate_json_export(pois: list, output_path: str):
-    """Export POIs to JSON (UTF-8)."""
-    export = {
-        'pois': pois,
-        '_meta': {
-            'schema_version': '1.0',
-            'encoding': 'UTF-8',
-            'coordinate_system': 'WGS84',
-            'total_records': len(pois),
-            'contract': 'NAVER Cloud Corporation Pilot Agreement',
-            'provider': 'Farq Technology Establishment',
-            'generated_at': datetime.now(timezone.utc).isoformat(),
-        },
+    writer = CsvExportWriter(output_path)
+    for poi in pois:
+        writer.write(poi)
+    writer.close()
+
+
+def _nested_json(obj, depth: int) -> bytes:
+    """Serialize `obj` as it appears `depth` levels deep in an indent=2 dump."""
+    text = json.dumps(obj, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + '  ' * depth).encode('utf-8')
+
+
+def export_meta(total_records: int) -> dict:
+    """Metadata block shipped with the JSON / NDJSON export."""
+    return {
+        'schema_version': '1.0',
+        'encoding': 'UTF-8',
+        'coordinate_system': 'WGS84',
+        'total_records': total_records,
+        'contract': 'NAVER Cloud Corporation Pilot Agreement',
+        'provider': 'Farq Technology Establishment',
+        'generated_at': datetime.now(timezone.utc).isoformat(),
     }
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(export, f, indent=2, ensure_ascii=False)
+
+
+class JsonExportWriter:
+    """
+    Incremental JSON export writer (UTF-8). Output is byte-identical to
+    json.dump(export, indent=2, ensure_ascii=False). Continues a partial
+    file at `resume_offset` that already holds `written` records.
+    """
+
+    def __init__(self, output_path: str, resume_offset: int = 0, written: int = 0):
+        self.file = open(output_path, 'ab' if resume_offset else 'wb')
+        self.count = written
+        if not resume_offset:
+            self.file.write(b'{\n  "pois": [')
+
+    def write(self, poi: dict) -> tuple:
+        """Append one record; returns (global_id, byte_offset, byte_length)."""
+        self.file.write(b',\n    ' if self.count else b'\n    ')
+        record = _nested_json(poi, 2)
+        entry = (poi.get('global_id'), self.file.tell(), len(record))
+        self.file.write(record)
+        self.count += 1
+        return entry
+
+    def close(self):
+        self.file.write(b'\n  ],\n' if self.count else b'],\n')
+        self.file.write(b'  "_meta": ' + _nested_json(export_meta(self.count), 1) + b'\n}')
+        self.file.close()
+
+
+class NdjsonExportWriter:
+    """
+    Incremental NDJSON export writer (UTF-8, one record per line) using a
+    pluggable encoder from ndjson_io. The `_meta` block of the JSON export
+    goes to a `<name>.meta.json` sidecar.
+    """
+
+    def __init__(self, output_path: str, resume_offset: int = 0, written: int = 0,
+                 encoder: str = 'auto'):
+        self.path = output_path
+        self.file = open(output_path, 'ab' if resume_offset else 'wb')
+        self.count = written
+        self._encode = get_encoder(encoder)
+
+    def write(self, poi: dict) -> tuple:
+        """Append one record; returns (global_id, byte_offset, byte_length)."""
+        record = self._encode(poi)
+        entry = (poi.get('global_id'), self.file.tell(), len(record))
+        self.file.write(record + b'\n')
+        self.count += 1
+        return entry
+
+    def close(self):
+        self.file.close()
+        meta_path = os.path.splitext(self.path)[0] + '.meta.json'
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(export_meta(self.count), f, indent=2, ensure_ascii=False)
+
+
+def generate_json_export(pois: list, output_path: str) -> list:
+    """
+    Export POIs to JSON (UTF-8).
+    Returns (global_id, byte_offset, byte_length) for every record written,
+    for use by the sidecar offset index.
+    """
+    writer = JsonExportWriter(output_path)
+    entries = [writer.write(poi) for poi in pois]
+    writer.close()
+    return entries
 
 
 def generate_data_dictionary(output_path: str):
@@ -141,8 +251,9 @@ def generate_data_dictionary(output_path: str):
         }, f, indent=2, ensure_ascii=False)
 
 
-def generate_compliance_statement(output_path: str, total_pois: int, accuracy: float):
-    """Generate compliance statement text."""
+def generate_compliance_statement(output_path: str, total_pois: int, accuracy: float,
+                                  json_format: str = 'json'):
+    """Generate compliance statement text. `json_format` is the JSON export's format (json / ndjson)."""
     content = f"""
 ================================================================================
           COMPLIANCE STATEMENT — NAVER POI PILOT DELIVERY
@@ -156,7 +267,7 @@ This delivery package is certified to comply with the terms of the
 NAVER POI Pilot Agreement as follows:
 
 1. DATA FORMAT
-   - Delivery Format:    CSV and JSON (both included)
+   - Delivery Format:    CSV and {json_format.upper()} (both included)
    - Encoding:           UTF-8
    - Coordinate System:  WGS84
 
@@ -197,40 +308,119 @@ NAVER POI Pilot Agreement as follows:
 
 def main():
     parser = argparse.ArgumentParser(description='NAVER Delivery Package Generator')
-    parser.add_argument('--input', '-i', required=True, help='Input POI data (JSON or CSV)')
+    parser.add_argument('--input', '-i', required=True, nargs='+',
+                        help='Input POI data files, directories or glob patterns (JSON or CSV)')
     parser.add_argument('--output', '-o', default='./NAVER_PILOT_DELIVERY', help='Output directory')
-    parser.add_argument('--format', '-f', choices=['json', 'csv'], default=None)
+    parser.add_argument('--format', '-f', choices=INPUT_FORMATS, default=None)
+    parser.add_argument('--json-format', choices=['json', 'ndjson'], default='json',
+                        help='Record export format in /json (default: json)')
+    parser.add_argument('--json-encoder', choices=['auto', *JSON_ENCODERS], default='auto',
+                        help='Encoder for NDJSON export (auto prefers orjson when installed)')
+    parser.add_argument('--index', action='store_true',
+                        help='Write a global_id -> byte offset index next to the JSON export')
+    parser.add_argument('--tiles', action='store_true',
+                        help='Write per-tile map/KPI aggregates to tiles/tile_aggregates.json')
+    parser.add_argument('--media', action='store_true',
+                        help='Fetch referenced images/videos into /media (deduplicated by SHA-256)')
+    parser.add_argument('--media-root', default='.',
+                        help='Directory local and file:// media must resolve inside')
+    parser.add_argument('--media-workers', type=int, default=DEFAULT_MEDIA_WORKERS,
+                        help='Concurrent media fetches')
+    parser.add_argument('--registry', default=None,
+                        help='Delivered global_id registry: check this batch against it, and '
+                             'append it when the QA decision is ACCEPT')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for QA sampling reproducibility')
+    parser.add_argument('--qa-strata', default=None, metavar='FIELD',
+                        help='Also report QA decision odds for a 30%% sample of every FIELD value')
+    parser.add_argument('--qa-trials', type=int, default=DEFAULT_QA_TRIALS,
+                        help='Monte Carlo samples for the stratified QA odds')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for loading multiple files (default: one per CPU)')
+    parser.add_argument('--dedup', choices=DEDUP_POLICIES, default='last-wins',
+                        help='Which record to keep when a global_id appears more than once')
+    parser.add_argument('--checkpoint-every', type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                        help='Records between checkpoints (0 disables checkpointing)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue from the last checkpoint in the output directory')
     args = parser.parse_args()
 
-    # Detect format
-    fmt = args.format
-    if not fmt:
-        ext = os.path.splitext(args.input)[1].lower()
-        fmt = 'csv' if ext == '.csv' else 'json'
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    try:
+        files = expand_inputs(args.input)
+    except FileNotFoundError as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
 
     # Load
-    print(f'Loading data from {args.input}...')
-    pois = load_csv(args.input) if fmt == 'csv' else load_json(args.input)
+    print(f'Loading data from {", ".join(files)}...')
+    pois, duplicates = merge_pois(load_inputs(files, args.format, args.workers), args.dedup)
     print(f'Loaded {len(pois)} POIs')
+    if duplicates['duplicate_global_ids']:
+        print(f'  {duplicates["duplicate_global_ids"]} duplicate global_id(s), '
+              f'{duplicates["dropped_records"]} record(s) dropped ({args.dedup})')
 
     # Create directory structure
     base = args.output
     for d in ['csv', 'json', 'media']:
         os.makedirs(os.path.join(base, d), exist_ok=True)
-
-    # 1. Export CSV
     csv_path = os.path.join(base, 'csv', 'naver_poi_delivery.csv')
-    generate_csv_export(pois, csv_path)
+    json_path = os.path.join(base, 'json', f'naver_poi_delivery.{args.json_format}')
+
+    ckpt = RunCheckpoint(os.path.join(base, '.checkpoint'),
+                         input_fingerprint(files, format=args.format, dedup=args.dedup, seed=args.seed,
+                                           json_format=args.json_format,
+                                           json_encoder=resolve_encoder(args.json_encoder)),
+                         every=args.checkpoint_every)
+    try:
+        state = ckpt.begin(args.resume, {'csv': csv_path, 'json': json_path})
+    except CheckpointError as e:
+        print(f'ERROR: cannot resume: {e}')
+        sys.exit(1)
+    start = state['next_index']
+    results = [rec['r'] for rec in ckpt.spilled]
+    index_entries = [tuple(rec['x']) for rec in ckpt.spilled if rec['x']]
+    if start:
+        print(f'Resuming from checkpoint at record {start}')
+
+    # POIs delivered in an earlier batch are validated and reported, not re-shipped
+    repeated = previously_delivered(pois, args.registry) if args.registry else set()
+
+    # 1-3. Export CSV + JSON and validate, one record at a time
+    print('  Exporting and validating...')
+    csv_writer = CsvExportWriter(csv_path, state['offsets']['csv'])
+    written = start - sum(1 for i in repeated if i < start)
+    if args.json_format == 'ndjson':
+        json_writer = NdjsonExportWriter(json_path, state['offsets']['json'], written,
+                                         args.json_encoder)
+    else:
+        json_writer = JsonExportWriter(json_path, state['offsets']['json'], written)
+    for i in range(start, len(pois)):
+        poi = pois[i]
+        entry = None
+        if i not in repeated:
+            csv_writer.write(poi)
+            entry = json_writer.write(poi)
+            index_entries.append(entry)
+        result = validate_poi(poi, i)
+        results.append(result)
+        ckpt.append({'r': result, 'x': entry and list(entry)})
+        if ckpt.due(i + 1):
+            ckpt.save(i + 1, {'csv': csv_writer.file, 'json': json_writer.file})
+    csv_writer.close()
+    json_writer.close()
     print(f'  CSV export: {csv_path}')
+    print(f'  {args.json_format.upper()} export: {json_path}')
+    if args.index:
+        idx_path = index_path_for(json_path)
+        write_index(index_entries, idx_path)
+        print(f'  Record index: {idx_path}')
 
-    # 2. Export JSON
-    json_path = os.path.join(base, 'json', 'naver_poi_delivery.json')
-    generate_json_export(pois, json_path)
-    print(f'  JSON export: {json_path}')
-
-    # 3. Validate
-    print('  Running validation...')
-    results = [validate_poi(poi, i) for i, poi in enumerate(pois)]
+    if args.registry:
+        flagged = flag_previously_delivered(results, repeated)
+        print(f'  {flagged} POI(s) already delivered in an earlier batch (left out of the exports)')
+    apply_compliance_scores(pois, results)
 
     # 4. Validation report
     val_report = generate_validation_report(results)
@@ -240,7 +430,7 @@ def main():
     print(f'  Validation report: {vr_path}')
 
     # 5. KPI summary
-    kpi = qa_sample_and_calculate_kpi(results)
+    kpi = qa_sample_and_calculate_kpi(results, pois, args.qa_strata, args.qa_trials, args.seed)
     kpi_path = os.path.join(base, 'kpi_summary.json')
     with open(kpi_path, 'w', encoding='utf-8') as f:
         json.dump(kpi, f, indent=2, ensure_ascii=False)
@@ -252,7 +442,7 @@ def main():
     print(f'  Completeness report: {comp_path}')
 
     # 7. Billing
-    billing = calculate_billing(pois)
+    billing = calculate_billing(pois, results)
     bill_path = os.path.join(base, 'billing_summary.json')
     with open(bill_path, 'w', encoding='utf-8') as f:
         json.dump(billing, f, indent=2, ensure_ascii=False)
@@ -266,9 +456,45 @@ def main():
     # 9. Compliance statement
     accuracy = val_report['summary']['accuracy_pct']
     cs_path = os.path.join(base, 'compliance_statement.txt')
-    generate_compliance_statement(cs_path, len(pois), accuracy)
+    generate_compliance_statement(cs_path, len(pois) - len(repeated), accuracy, args.json_format)
     print(f'  Compliance statement: {cs_path}')
 
+    # 10. Duplicate global_id report
+    if duplicates['duplicate_global_ids']:
+        dup_path = os.path.join(base, 'duplicates_report.json')
+        with open(dup_path, 'w', encoding='utf-8') as f:
+            json.dump(duplicates, f, indent=2, ensure_ascii=False)
+        print(f'  Duplicates report: {dup_path}')
+
+    # 11. Media assets
+    if args.media:
+        print('  Packaging media...')
+        shipped = [poi for i, poi in enumerate(pois) if i not in repeated]
+        manifest = package_media(shipped, os.path.join(base, 'media'), args.media_root, args.media_workers)
+        m = manifest['summary']
+        print(f'  Media: {m["linked_files"]} file(s), {m["unique_objects"]} unique, '
+              f'{m["failed_references"]} failed -> {os.path.join(base, "media", "media_manifest.json")}')
+
+    # 12. Tile aggregates for dashboards
+    if args.tiles:
+        os.makedirs(os.path.join(base, 'tiles'), exist_ok=True)
+        tiles_path = os.path.join(base, 'tiles', 'tile_aggregates.json')
+        write_tile_aggregates(aggregate_tiles(pois, results), tiles_path)
+        print(f'  Tile aggregates: {tiles_path}')
+
+    # 13. Record delivered global_ids (accepted batches only, so a batch can be
+    #     fixed and regenerated after REQUIRE_CORRECTION)
+    if args.registry and kpi['decision'] == 'ACCEPT':
+        with IdRegistry(args.registry) as registry:
+            added = registry.add(poi.get('global_id') for poi, r in zip(pois, results)
+                                 if PREVIOUSLY_DELIVERED not in r['errors'])
+            print(f'  Registry: {added} global_id(s) added ({registry.count} total) -> {args.registry}')
+    elif args.registry:
+        print(f'  Registry: not updated ({kpi["decision"]}); record the batch after sign-off with '
+              f'id_registry.py --registry {args.registry} --add <input>')
+
+    ckpt.finish()
+
     # Summary
     s = val_report['summary']
     b = billing['billing']
@@ -279,8 +505,12 @@ def main():
     print(f'  Total POIs:       {s["total_pois"]}')
     print(f'  Valid:            {s["valid_pois"]}')
     print(f'  Accuracy:         {s["accuracy_pct"]}%')
-    print(f'  QA Decision:      {kpi["decision"]}')
+    print(f'  QA Decision:      {kpi["decision"]} '
+          f'(P(ACCEPT) {kpi["decision_probability"]["ACCEPT"] * 100:.2f}%)')
     print(f'  Total Cost:       {b["subtotal_sar"]:,.2f} SAR')
+    if billing['delivery']['previously_delivered_pois']:
+        print(f'  Not Shipped:      {billing["delivery"]["previously_delivered_pois"]} previously delivered POI(s) '
+              f'(not billed)')
     print(f'  Budget Status:    {"OVER BUDGET" if b["over_budget"] else "WITHIN BUDGET"}')
     print(f'{"=" * 60}')
 
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Delivered global_id Registry
+=============================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Persistent set of every global_id delivered so far, so a POI cannot be
+delivered (and billed) twice across batches. The registry is a sorted array
+of 128-bit keys (see delivery_index.global_id_key), memory-mapped for
+lookups. A batch is sorted and probed in key order, so checking it against
+tens of millions of historical IDs touches only the pages it needs and
+almost no RAM; adding a batch is a single sequential merge into a new file.
+
+File layout:
+    header   8s magic | Q count
+    keys     count × 16 bytes, ascending
+
+Usage:
+    python id_registry.py --registry delivered_ids.reg --check data.json
+    python id_registry.py --registry delivered_ids.reg --add data.json
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from delivery_index import global_id_key
+
+REGISTRY_MAGIC = b'POIREG01'
+REGISTRY_HEADER = struct.Struct('<8sQ')
+KEY_SIZE = 16
+COPY_CHUNK = 64 * 1024 * 1024
+
+
+class IdRegistry:
+    """Sorted, memory-mapped set of delivered global_id keys."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mm = None
+        self._open()
+
+    def _open(self):
+        self.count = 0
+        if not os.path.exists(self.path):
+            return
+        self._file = open(self.path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = REGISTRY_HEADER.unpack_from(self._mm, 0)
+        if magic != REGISTRY_MAGIC or len(self._mm) != REGISTRY_HEADER.size + self.count * KEY_SIZE:
+            self.close()
+            raise ValueError(f'not a valid global_id registry: {self.path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _key_at(self, i: int) -> bytes:
+        start = REGISTRY_HEADER.size + i * KEY_SIZE
+        return self._mm[start:start + KEY_SIZE]
+
+    def _bisect(self, key: bytes, lo: int = 0) -> int:
+        """
+        Index of the first stored key >= `key`, searching from `lo`.
+        Gallops forward first, so a sorted batch of M keys costs
+        O(M · log(N / M)) probes instead of O(M · log N).
+        """
+        step = 1
+        while lo + step <= self.count and self._key_at(lo + step - 1) < key:
+            lo += step
+            step *= 2
+        hi = min(lo + step - 1, self.count)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _sorted_keys(self, global_ids) -> list:
+        keyed = {}
+        for gid in global_ids:
+            if gid is not None and str(gid).strip():
+                keyed.setdefault(global_id_key(gid), []).append(gid)
+        return sorted(keyed.items())
+
+    def contains_many(self, global_ids) -> set:
+        """Return the subset of `global_ids` already in the registry."""
+        found = set()
+        lo = 0
+        for key, gids in self._sorted_keys(global_ids):
+            lo = self._bisect(key, lo)
+            if lo < self.count and self._key_at(lo) == key:
+                found.update(gids)
+        return found
+
+    def add(self, global_ids) -> int:
+        """
+        Merge new global_ids into the registry file (atomic replace).
+        Returns the number of keys added.
+        """
+        new_keys = []
+        lo = 0
+        for key, _ in self._sorted_keys(global_ids):
+            lo = self._bisect(key, lo)
+            if lo >= self.count or self._key_at(lo) != key:
+                new_keys.append((lo, key))
+        if not new_keys and self._mm is not None:
+            return 0
+
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as out:
+            out.write(REGISTRY_HEADER.pack(REGISTRY_MAGIC, self.count + len(new_keys)))
+            prev = 0
+            for pos, key in new_keys:
+                self._copy(out, prev, pos)
+                out.write(key)
+                prev = pos
+            self._copy(out, prev, self.count)
+            out.flush()
+            os.fsync(out.fileno())
+        self.close()
+        os.replace(tmp, self.path)
+        self._open()
+        return len(new_keys)
+
+    def _copy(self, out, start: int, end: int):
+        """Copy stored keys [start, end) to `out` in bounded chunks."""
+        first = REGISTRY_HEADER.size + start * KEY_SIZE
+        last = REGISTRY_HEADER.size + end * KEY_SIZE
+        for pos in range(first, last, COPY_CHUNK):
+            out.write(self._mm[pos:min(pos + COPY_CHUNK, last)])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    from validate import expand_inputs, load_inputs
+
+    parser = argparse.ArgumentParser(description='NAVER Delivered global_id Registry')
+    parser.add_argument('--registry', '-r', required=True, help='Registry file')
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--check', nargs='+', metavar='INPUT',
+                        help='Report global_ids in these inputs that were already delivered')
+    action.add_argument('--add', nargs='+', metavar='INPUT',
+                        help='Record the global_ids in these inputs as delivered')
+    args = parser.parse_args()
+
+    try:
+        files = expand_inputs(args.check or args.add)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    ids = [poi.get('global_id') for _, pois in load_inputs(files) for poi in pois]
+    with IdRegistry(args.registry) as registry:
+        if args.check:
+            delivered = registry.contains_many(ids)
+            for gid in sorted(delivered, key=str):
+                print(gid)
+            print(f'{len(delivered)} of {len(ids)} global_id(s) already delivered '
+                  f'(registry: {registry.count})', file=sys.stderr)
+            sys.exit(1 if delivered else 0)
+        added = registry.add(ids)
+        print(f'Added {added} global_id(s); registry now holds {registry.count}')
+
+
+if __name__ == '__main__':
+    main()
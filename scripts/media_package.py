@@ -0,0 +1,198 @@
+"""
+Delivery Media Packaging
+=========================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Fills the delivery /media folder with every image and video referenced by
+the POIs. Sources (http/https URLs, file:// URLs or local paths, which must
+resolve inside --media-root) are fetched once each by a bounded thread pool,
+stored once per SHA-256 digest, and hard-linked into per-POI folders:
+
+    /media
+      /objects/<sha[:2]>/<sha256>          - content store (one copy per digest)
+      /<global_id>/<field><ext>            - hard links into the store, with the
+                                             extension of the referencing URL
+                                             (ids that are not filename-safe get
+                                             a short hash suffix)
+      media_manifest.json                  - global_id -> files, failures, totals
+
+Completed sources are journaled as they finish, so an interrupted stage
+resumes without fetching them again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from compliance import IMAGE_URL_FIELDS, VIDEO_URL_FIELDS
+
+MEDIA_FIELDS = IMAGE_URL_FIELDS + VIDEO_URL_FIELDS
+DEFAULT_MEDIA_WORKERS = 8
+FETCH_TIMEOUT_S = 60
+CHUNK_SIZE = 1024 * 1024
+JOURNAL_FILE = '.media_journal.ndjson'
+MANIFEST_FILE = 'media_manifest.json'
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def _safe_name(value) -> str:
+    """Folder name for a global_id; sanitized ids get a hash of the raw id so they cannot collide."""
+    raw = str(value).strip()
+    safe = _UNSAFE.sub('_', raw)
+    if safe != raw or safe in ('', '.', '..'):
+        safe += '-' + hashlib.sha256(raw.encode('utf-8')).hexdigest()[:8]
+    return safe
+
+
+def _extension(source: str) -> str:
+    path = urllib.parse.urlparse(source).path if '://' in source else source
+    ext = os.path.splitext(path)[1].lower()
+    return ext if re.fullmatch(r'\.[a-z0-9]{1,5}', ext) else '.bin'
+
+
+def collect_media(pois: list) -> list:
+    """Return (global_id, field, source) for every media reference, in POI order."""
+    refs = []
+    for i, poi in enumerate(pois):
+        gid = poi.get('global_id') or f'ROW_{i}'
+        for field in MEDIA_FIELDS:
+            value = poi.get(field)
+            if isinstance(value, str) and value.strip().lower() not in ('', 'n/a', 'na', '--', 'null', 'none'):
+                refs.append((str(gid), field, value.strip()))
+    return refs
+
+
+def _open_source(source: str, media_root: str):
+    scheme = urllib.parse.urlparse(source).scheme.lower()
+    if scheme in ('http', 'https'):
+        return urllib.request.urlopen(source, timeout=FETCH_TIMEOUT_S)
+    path = urllib.request.url2pathname(urllib.parse.urlparse(source).path) if scheme == 'file' else source
+    root = os.path.realpath(media_root)
+    full = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, full]) != root:
+        raise PermissionError(f'source_outside_media_root: "{source}"')
+    return open(full, 'rb')
+
+
+def fetch_object(source: str, media_dir: str, media_root: str) -> dict:
+    """Fetch one source into the content store; returns its journal entry."""
+    tmp_dir = os.path.join(media_dir, 'objects', '.tmp')
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out, _open_source(source, media_root) as src:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        sha = digest.hexdigest()
+        rel = os.path.join('objects', sha[:2], sha)
+        target = os.path.join(media_dir, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {'source': source, 'sha256': sha, 'object': rel, 'bytes': size}
+
+
+def _link(target: str, link_path: str):
+    os.makedirs(os.path.dirname(link_path), exist_ok=True)
+    if os.path.exists(link_path):
+        if os.path.samefile(target, link_path):
+            return
+        os.remove(link_path)
+    try:
+        os.link(target, link_path)
+    except OSError:  # filesystem without hard links
+        shutil.copy2(target, link_path)
+
+
+def package_media(pois: list, media_dir: str, media_root: str = '.',
+                  workers: int = DEFAULT_MEDIA_WORKERS) -> dict:
+    """
+    Fetch, deduplicate and link all POI media into `media_dir`.
+    Writes and returns the media manifest.
+    """
+    os.makedirs(os.path.join(media_dir, 'objects', '.tmp'), exist_ok=True)
+    journal_path = os.path.join(media_dir, JOURNAL_FILE)
+
+    done = {}
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # torn final line from an interrupted run
+                    continue
+                if os.path.exists(os.path.join(media_dir, entry['object'])):
+                    done[entry['source']] = entry
+
+    refs = collect_media(pois)
+    pending = [s for s in dict.fromkeys(source for _, _, source in refs) if s not in done]
+    failed = {}
+    with open(journal_path, 'a', encoding='utf-8') as journal, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_object, s, media_dir, media_root): s for s in pending}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed[source] = f'{type(e).__name__}: {e}'
+                continue
+            done[source] = entry
+            journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            journal.flush()
+
+    files = {}
+    failures = []
+    for gid, field, source in refs:
+        entry = done.get(source)
+        if entry is None:
+            failures.append({'global_id': gid, 'field': field, 'source': source,
+                             'error': failed.get(source, 'not fetched')})
+            continue
+        rel = os.path.join(_safe_name(gid), field + _extension(source))
+        _link(os.path.join(media_dir, entry['object']), os.path.join(media_dir, rel))
+        files.setdefault(gid, []).append({
+            'field': field, 'file': rel, 'source': source,
+            'sha256': entry['sha256'], 'bytes': entry['bytes'],
+        })
+
+    unique = {e['sha256']: e['bytes'] for e in done.values()}
+    manifest = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'summary': {
+            'references': len(refs),
+            'linked_files': sum(len(v) for v in files.values()),
+            'unique_objects': len(unique),
+            'stored_bytes': sum(unique.values()),
+            'referenced_bytes': sum(f['bytes'] for v in files.values() for f in v),
+            'failed_references': len(failures),
+        },
+        'files': files,
+        'failed': failures,
+    }
+    with open(os.path.join(media_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    if not failures:
+        os.remove(journal_path)
+    shutil.rmtree(os.path.join(media_dir, 'objects', '.tmp'), ignore_errors=True)
+    return manifest
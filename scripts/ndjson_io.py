@@ -0,0 +1,124 @@
+"""
+NDJSON Input / Output
+======================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Line-delimited JSON (one POI object per line) for delivery input and export.
+
+Input is parsed in parallel: the file is cut into byte ranges that end on
+newline boundaries, and each range is decoded by a worker process.
+
+Output goes through a pluggable record encoder. 'orjson' is used when the
+package is installed ('auto'); 'json' is the standard-library fallback.
+Both emit UTF-8 without ASCII escaping, matching the JSON export. Records
+holding NaN or Infinity (e.g. a "nan" CSV coordinate) always go through the
+standard library, which writes them as the JSON export does instead of null.
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+RANGES_PER_WORKER = 4
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENCODERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_stdlib_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _encode_json(obj) -> bytes:
+    return _stdlib_encoder.encode(obj).encode('utf-8')
+
+
+def _has_non_finite(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _encode_orjson(obj) -> bytes:
+    if _has_non_finite(obj):  # orjson would write null
+        return _encode_json(obj)
+    try:
+        return orjson.dumps(obj)
+    except TypeError:  # e.g. integers beyond 64 bits
+        return _encode_json(obj)
+
+
+JSON_ENCODERS = {'json': _encode_json}
+if orjson is not None:
+    JSON_ENCODERS['orjson'] = _encode_orjson
+
+
+def resolve_encoder(name: str = 'auto') -> str:
+    """Concrete encoder name for 'auto', 'orjson' or 'json'."""
+    if name == 'auto':
+        return 'orjson' if 'orjson' in JSON_ENCODERS else 'json'
+    return name
+
+
+def get_encoder(name: str = 'auto'):
+    """Return a `obj -> bytes` record encoder by name ('auto', 'orjson', 'json')."""
+    name = resolve_encoder(name)
+    if name not in JSON_ENCODERS:
+        raise ValueError(f'JSON encoder not available: {name}')
+    return JSON_ENCODERS[name]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARALLEL LOADER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def split_ranges(filepath: str, parts: int) -> list:
+    """Cut a file into up to `parts` (start, end) byte ranges ending on newlines."""
+    size = os.path.getsize(filepath)
+    bounds = [0]
+    with open(filepath, 'rb') as f:
+        for i in range(1, parts):
+            target = max(size * i // parts, bounds[-1])
+            f.seek(target)
+            f.readline()
+            pos = min(f.tell(), size)
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_range(filepath: str, start: int, end: int) -> list:
+    """Decode the NDJSON records in bytes [start, end) of a file."""
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def load_ndjson(filepath, workers=None):
+    """Load POI data from an NDJSON file, parsing byte ranges in parallel."""
+    size = os.path.getsize(filepath)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or size < PARALLEL_MIN_BYTES:
+        return parse_range(filepath, 0, size)
+    ranges = split_ranges(filepath, workers * RANGES_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(parse_range, [filepath] * len(ranges),
+                          [s for s, _ in ranges], [e for _, e in ranges])
+        return [poi for chunk in chunks for poi in chunk]
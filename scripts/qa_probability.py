@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+QA Decision Probability
+========================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+The contract KPI is decided on one random 30% sample, so the same data can
+come out ACCEPT on one run and REQUIRE_CORRECTION on the next. With the
+invalid count known, the number of invalid records in the sample is
+hypergeometric, and the probability of every decision can be computed
+exactly instead of trusting a single draw.
+
+- Simple random sample: exact hypergeometric distribution.
+- Stratified sample (e.g. 30% of every category): exact convolution of the
+  per-stratum hypergeometrics, plus a Monte Carlo run with many thousands
+  of samples as a cross-check. Each trial draws one invalid count per
+  stratum from that stratum's exact distribution (batched random.choices),
+  so no individual records are drawn.
+
+Usage:
+    python qa_probability.py --total 2000 --invalid 70
+    python qa_probability.py --total 2000 --invalid 70 --target 0.99
+"""
+
+import argparse
+import math
+import random
+from collections import Counter
+from itertools import accumulate
+
+QA_DECISIONS = ('ACCEPT', 'REQUIRE_CORRECTION', 'REQUIRE_RESURVEY')
+DEFAULT_QA_TRIALS = 20000
+DEFAULT_ACCEPT_TARGET = 0.95
+TAIL_EPSILON = 1e-16   # terms this far below the mode are dropped
+
+
+def hypergeom_pmf(population: int, marked: int, draws: int):
+    """
+    Distribution of marked items in a sample of `draws` taken without
+    replacement. Returns (first, probs), with probs[i] = P(X = first + i).
+    Built outward from the mode by the term ratio, so it stays in floating
+    point for any population size; negligible tails are trimmed.
+    """
+    lo = max(0, draws - (population - marked))
+    hi = min(draws, marked)
+    mode = min(max((draws + 1) * (marked + 1) // (population + 2), lo), hi)
+    rest = population - marked - draws
+
+    up, p, k = [1.0], 1.0, mode
+    while k < hi:
+        p *= (marked - k) * (draws - k) / ((k + 1) * (rest + k + 1))
+        if p < TAIL_EPSILON:
+            break
+        up.append(p)
+        k += 1
+    down, p, k = [], 1.0, mode
+    while k > lo:
+        p *= k * (rest + k) / ((marked - k + 1) * (draws - k + 1))
+        if p < TAIL_EPSILON:
+            break
+        down.append(p)
+        k -= 1
+
+    probs = down[::-1] + up
+    total = sum(probs)
+    return mode - len(down), [q / total for q in probs]
+
+
+def _trim(first: int, probs: list):
+    cutoff = max(probs) * TAIL_EPSILON
+    lo = next(i for i, q in enumerate(probs) if q >= cutoff)
+    hi = len(probs) - next(i for i, q in enumerate(reversed(probs)) if q >= cutoff)
+    return first + lo, probs[lo:hi]
+
+
+def convolve(a, b):
+    """Distribution of the sum of two independent (first, probs) distributions."""
+    (fa, pa), (fb, pb) = a, b
+    out = [0.0] * (len(pa) + len(pb) - 1)
+    for i, x in enumerate(pa):
+        out[i:i + len(pb)] = [s + x * y for s, y in zip(out[i:i + len(pb)], pb)]
+    return _trim(fa + fb, out)
+
+
+def decision_probabilities(dist, sample_size: int, decide) -> dict:
+    """
+    P(decision) given the distribution of invalid records in the sample.
+    `decide(valid_in_sample, sample_size)` applies the contract thresholds.
+    """
+    first, probs = dist
+    out = dict.fromkeys(QA_DECISIONS, 0.0)
+    for i, p in enumerate(probs):
+        out[decide(sample_size - first - i, sample_size)] += p
+    return out
+
+
+def fixes_for_accept(total: int, invalid: int, sample_size: int, decide,
+                     target: float = DEFAULT_ACCEPT_TARGET) -> int:
+    """Fewest invalid records to fix before P(ACCEPT) reaches `target`."""
+    def p_accept(k):
+        return decision_probabilities(hypergeom_pmf(total, k, sample_size),
+                                      sample_size, decide)['ACCEPT']
+    lo, hi = 0, invalid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if p_accept(invalid - mid) >= target:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def simulate_decisions(strata: list, decide, trials: int = DEFAULT_QA_TRIALS, seed=None) -> dict:
+    """
+    Monte Carlo decision frequencies for a stratified sample.
+    `strata` is a list of (population, invalid, sample_size) per stratum.
+    Uses its own generator, so the global QA draw is unaffected.
+    """
+    rng = random.Random(seed)
+    sample_size = sum(n for _, _, n in strata)
+    totals = [0] * trials
+    for population, invalid, draws in strata:
+        first, probs = hypergeom_pmf(population, invalid, draws)
+        if len(probs) == 1:
+            if first:
+                totals = [t + first for t in totals]
+            continue
+        picks = rng.choices(range(first, first + len(probs)),
+                            cum_weights=list(accumulate(probs)), k=trials)
+        totals = [t + k for t, k in zip(totals, picks)]
+
+    counts = dict.fromkeys(QA_DECISIONS, 0)
+    for k, c in Counter(totals).items():
+        counts[decide(sample_size - k, sample_size)] += c
+    return {d: c / trials for d, c in counts.items()}
+
+
+def _report(probs: dict) -> dict:
+    return {
+        **{d: round(p, 6) for d, p in probs.items()},
+        'most_likely': max(QA_DECISIONS, key=lambda d: probs[d]),
+    }
+
+
+def simple_decision_report(total: int, invalid: int, sample_size: int, decide,
+                           target: float = DEFAULT_ACCEPT_TARGET) -> dict:
+    """kpi_summary block for a simple random sample of `sample_size`."""
+    dist = hypergeom_pmf(total, invalid, sample_size)
+    return {
+        'method': 'exact_hypergeometric',
+        'invalid_pois': invalid,
+        **_report(decision_probabilities(dist, sample_size, decide)),
+        f'fixes_for_{round(target * 100)}pct_accept':
+            fixes_for_accept(total, invalid, sample_size, decide, target),
+    }
+
+
+def stratified_decision_report(strata: dict, rate: float, decide,
+                               trials: int = DEFAULT_QA_TRIALS, seed=None) -> dict:
+    """
+    kpi_summary block for sampling `rate` of every stratum.
+    `strata` maps stratum key -> (population, invalid).
+    """
+    table = {key: (n, bad, max(1, int(math.ceil(n * rate)))) for key, (n, bad) in sorted(strata.items())}
+    sample_size = sum(s for _, _, s in table.values())
+    dist = (0, [1.0])
+    for population, invalid, draws in table.values():
+        dist = convolve(dist, hypergeom_pmf(population, invalid, draws))
+    simulated = simulate_decisions(list(table.values()), decide, trials, seed)
+    return {
+        'sample_size': sample_size,
+        'exact': _report(decision_probabilities(dist, sample_size, decide)),
+        'simulated': {
+            'trials': trials,
+            **_report(simulated),
+            'std_error': {d: round(math.sqrt(p * (1 - p) / trials), 6) for d, p in simulated.items()},
+        },
+        'strata': {key: {'population': n, 'invalid': bad, 'sample_size': s}
+                   for key, (n, bad, s) in table.items()},
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    from validate import SAMPLING_RATE, qa_decision
+
+    parser = argparse.ArgumentParser(description='NAVER QA Decision Probability')
+    parser.add_argument('--total', type=int, required=True, help='POIs in the delivery')
+    parser.add_argument('--invalid', type=int, required=True, help='Invalid POIs in the delivery')
+    parser.add_argument('--target', type=float, default=DEFAULT_ACCEPT_TARGET,
+                        help='P(ACCEPT) to reach when counting fixes needed')
+    args = parser.parse_args()
+    if not 0 <= args.invalid <= args.total:
+        parser.error('--invalid must be between 0 and --total')
+
+    sample_size = max(1, int(math.ceil(args.total * SAMPLING_RATE)))
+    report = simple_decision_report(args.total, args.invalid, sample_size, qa_decision, args.target)
+    print(f'Sample: {sample_size} of {args.total} POIs ({args.invalid} invalid)')
+    for d in QA_DECISIONS:
+        print(f'  P({d}): {report[d] * 100:.4f}%')
+    fixes = report[f'fixes_for_{round(args.target * 100)}pct_accept']
+    print(f'Fix {fixes} invalid POI(s) for P(ACCEPT) >= {args.target * 100:g}%')
+
+
+if __name__ == '__main__':
+    main()
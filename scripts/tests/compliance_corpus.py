@@ -0,0 +1,79 @@
+"""
+Parity corpus for compliance.py against backend/src/utils/compliance.js.
+
+Cases are {"record": {...}, "options": {...}} keyed by backend column names,
+mixing filled, blank and oddly typed values across every category group.
+
+Regenerate the committed fixtures (needs node) with:
+    python scripts/tests/compliance_corpus.py
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(TESTS_DIR))
+COMPLIANCE_JS = os.path.join(REPO_ROOT, 'backend', 'src', 'utils', 'compliance.js')
+CORPUS_PATH = os.path.join(TESTS_DIR, 'fixtures', 'compliance_corpus.json')
+EXPECTED_PATH = os.path.join(TESTS_DIR, 'fixtures', 'compliance_expected_js.json')
+FIXTURE_CASES = 1000
+
+VALUES = [None, '', '  ', 'N/A', 'n/a', 'x', 0, False, True, [], ['a'], 21.5, {}, 'NA']
+CATEGORIES = ['restaurant', 'Cafe ', 'park', 'mosque', 'other', '', None, 'bakery', 'travel']
+
+
+def make_corpus(n: int, seed: int = 3) -> list:
+    from compliance import load_field_mappings
+
+    mappings = load_field_mappings()
+    fields = [f['local'] for f in mappings['compliance_fields']] + ['latitude', 'longitude', 'entrance_location']
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        record = {k: rng.choice(VALUES) for k in fields if rng.random() < 0.8}
+        record['category'] = rng.choice(CATEGORIES)
+        options = {}
+        for k in ('imageCount', 'videoCount', 'mediaCount'):
+            r = rng.random()
+            if r < 0.4:
+                options[k] = rng.randint(0, 3)
+            elif r < 0.5:
+                options[k] = None
+        if rng.random() < 0.2:
+            options['category'] = rng.choice(CATEGORIES)
+        cases.append({'record': record, 'options': options})
+    return cases
+
+
+def node_available() -> bool:
+    return shutil.which('node') is not None
+
+
+def run_js(cases: list) -> list:
+    """Score `cases` with calculateCompliance in node."""
+    script = ('const {calculateCompliance} = require(process.argv[1]);'
+              'let s = ""; process.stdin.on("data", d => s += d);'
+              'process.stdin.on("end", () => process.stdout.write(JSON.stringify('
+              'JSON.parse(s).map(c => calculateCompliance(c.record, c.options)))));')
+    out = subprocess.run(['node', '-e', script, COMPLIANCE_JS], input=json.dumps(cases),
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(TESTS_DIR))
+    cases = make_corpus(FIXTURE_CASES)
+    with open(CORPUS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(cases, f, separators=(',', ':'))
+        f.write('\n')
+    with open(EXPECTED_PATH, 'w', encoding='utf-8') as f:
+        json.dump(run_js(cases), f, separators=(',', ':'))
+        f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import copy
+import json
+import os
+import sys
+import uuid
+
+import pytest
+
+import generate_delivery
+import validate
+from id_registry import IdRegistry
+
+SAMPLE_POI = os.path.join(os.path.dirname(__file__), '..', '..', 'templates', 'sample_poi.json')
+CRASH_AT = 123
+VALIDATE_POI = validate.validate_poi
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    with open(SAMPLE_POI, encoding='utf-8') as f:
+        template = json.load(f)['pois'][0]
+    pois = []
+    for i in range(300):
+        poi = copy.deepcopy(template)
+        poi['global_id'] = str(uuid.uuid5(uuid.NAMESPACE_URL, f'poi-{i}'))
+        poi['name_en'] = f'{template["name_en"]} {i}'
+        poi['latitude'] = round(template['latitude'] + i * 0.001, 6)
+        if i % 7 == 0:
+            poi['phone_number'] = '12345'
+        if i % 11 == 0:
+            poi['category'] = 'Restaurant'
+        if i % 13 == 0:
+            poi['working_hours'] = '1 - 2 PM'
+        pois.append(poi)
+    path = tmp_path / 'pois.json'
+    path.write_text(json.dumps({'pois': pois}, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def _run(monkeypatch, module, argv, crash_at=None):
+    def validate_poi(poi, idx):
+        if idx == crash_at:
+            raise Crash(idx)
+        return VALIDATE_POI(poi, idx)
+
+    monkeypatch.setattr(module, 'validate_poi', validate_poi)
+    monkeypatch.setattr(sys, 'argv', [module.__name__ + '.py', *argv])
+    try:
+        module.main()
+    except SystemExit:
+        pass
+
+
+def _strip_generated_at(value):
+    if isinstance(value, dict):
+        return {k: _strip_generated_at(v) for k, v in value.items() if k != 'generated_at'}
+    if isinstance(value, list):
+        return [_strip_generated_at(v) for v in value]
+    return value
+
+
+def _snapshot(directory) -> dict:
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, directory)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if name.endswith('.json'):
+                files[rel] = _strip_generated_at(json.loads(data))
+            elif name == 'compliance_statement.txt':
+                files[rel] = [line for line in data.splitlines() if not line.startswith(b'Date:')]
+            else:
+                files[rel] = data
+    return files
+
+
+def _crash_and_resume(monkeypatch, module, argv, out, resume_every='50'):
+    with pytest.raises(Crash):
+        _run(monkeypatch, module, [*argv, '--output', out, '--checkpoint-every', '50'], CRASH_AT)
+    assert os.path.exists(os.path.join(out, '.checkpoint', 'state.json'))
+    _run(monkeypatch, module, [*argv, '--output', out, '--checkpoint-every', resume_every, '--resume'])
+    assert not os.path.exists(os.path.join(out, '.checkpoint'))
+
+
+def _registry(path, input_file):
+    # every 5th POI was delivered before, so the export skips records on both sides of the crash
+    with open(input_file, encoding='utf-8') as f:
+        ids = [poi['global_id'] for poi in json.load(f)['pois']]
+    with IdRegistry(str(path)) as registry:
+        registry.add(ids[::5])
+    return ['--registry', str(path)]
+
+
+@pytest.mark.parametrize('json_format, registry', [('json', False), ('ndjson', False), ('json', True)])
+def test_generate_delivery_resume_matches_uninterrupted_run(monkeypatch, tmp_path, input_file, json_format,
+                                                            registry):
+    argv = ['--input', input_file, '--seed', '7', '--index', '--json-format', json_format]
+    clean_argv, resumed_argv = argv, argv
+    if registry:
+        # one registry per run: an accepted run records its ids
+        clean_argv = [*argv, *_registry(tmp_path / 'clean.reg', input_file)]
+        resumed_argv = [*argv, *_registry(tmp_path / 'resumed.reg', input_file)]
+    _run(monkeypatch, generate_delivery, [*clean_argv, '--output', str(tmp_path / 'clean')])
+    _crash_and_resume(monkeypatch, generate_delivery, resumed_argv, str(tmp_path / 'resumed'))
+
+    clean, resumed = _snapshot(tmp_path / 'clean'), _snapshot(tmp_path / 'resumed')
+    assert f'json/naver_poi_delivery.{json_format}' in clean
+    assert 'json/naver_poi_delivery.idx' in clean
+    assert 'csv/naver_poi_delivery.csv' in clean
+    assert f'CSV and {json_format.upper()} (both included)'.encode() in b'\n'.join(clean['compliance_statement.txt'])
+    if registry:
+        assert clean['billing_summary.json']['delivery']['previously_delivered_pois'] == 60
+        assert len(clean['json/naver_poi_delivery.json']['pois']) == 240
+    assert resumed == clean
+
+
+@pytest.mark.parametrize('resume_every', ['50', '0'])
+def test_validate_resume_matches_uninterrupted_run(monkeypatch, tmp_path, input_file, resume_every):
+    argv = ['--input', input_file, '--seed', '7']
+    _run(monkeypatch, validate, [*argv, '--output', str(tmp_path / 'clean')])
+    _crash_and_resume(monkeypatch, validate, argv, str(tmp_path / 'resumed'), resume_every)
+
+    clean, resumed = _snapshot(tmp_path / 'clean'), _snapshot(tmp_path / 'resumed')
+    assert clean['validation_report.json']['summary']['total_pois'] == 300
+    assert resumed == clean
+
+
+def test_resume_with_different_seed_is_refused(monkeypatch, tmp_path, input_file, capsys):
+    out = str(tmp_path / 'out')
+    with pytest.raises(Crash):
+        _run(monkeypatch, validate, ['--input', input_file, '--seed', '7', '--output', out,
+                                     '--checkpoint-every', '50'], CRASH_AT)
+    _run(monkeypatch, validate, ['--input', input_file, '--seed', '8', '--output', out, '--resume'])
+    assert 'cannot resume' in capsys.readouterr().out
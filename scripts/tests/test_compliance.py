@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from compliance import ComplianceEngine, load_field_mappings
+from compliance_corpus import CORPUS_PATH, EXPECTED_PATH, make_corpus, node_available, run_js
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return ComplianceEngine(load_field_mappings())
+
+
+def _score(engine, cases):
+    return engine.score_batch([c['record'] for c in cases], [c.get('options') or {} for c in cases])
+
+
+def _mismatches(expected, actual):
+    assert len(expected) == len(actual)
+    return [(i, e, a) for i, (e, a) in enumerate(zip(expected, actual)) if e != a]
+
+
+def test_matches_committed_js_output(engine):
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        cases = json.load(f)
+    with open(EXPECTED_PATH, encoding='utf-8') as f:
+        expected = json.load(f)
+    assert _mismatches(expected, _score(engine, cases)) == []
+
+
+@pytest.mark.skipif(not node_available(), reason='node is not installed')
+def test_matches_node_on_generated_corpus(engine):
+    cases = make_corpus(5000, seed=11)
+    assert _mismatches(run_js(cases), _score(engine, cases)) == []
+
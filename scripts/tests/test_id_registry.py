@@ -0,0 +1,98 @@
+import json
+import random
+import sys
+import uuid
+
+import pytest
+
+import generate_delivery
+from delivery_index import global_id_key
+from id_registry import REGISTRY_HEADER, IdRegistry
+
+
+def _ids(n, seed):
+    rng = random.Random(seed)
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(n)]
+
+
+def _stored_keys(path):
+    with open(path, 'rb') as f:
+        data = f.read()[REGISTRY_HEADER.size:]
+    return [data[i:i + 16] for i in range(0, len(data), 16)]
+
+
+def test_add_merges_in_key_order(tmp_path):
+    path = str(tmp_path / 'delivered.reg')
+    first, second = _ids(500, 1), _ids(700, 2)
+    with IdRegistry(path) as registry:
+        assert registry.count == 0
+        assert registry.contains_many(first) == set()
+        assert registry.add(first + first[:10]) == 500
+        # second batch overlaps the first and interleaves with it
+        assert registry.add(second + first[::7]) == 700
+        assert registry.add(first + second) == 0
+        assert registry.count == 1200
+
+    keys = _stored_keys(path)
+    assert keys == sorted(global_id_key(g) for g in first + second)
+    with IdRegistry(path) as registry:
+        assert registry.count == 1200
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 7, 8, 9, 100, 1000])
+def test_bisect_matches_linear_search(tmp_path, size):
+    path = str(tmp_path / 'delivered.reg')
+    with IdRegistry(path) as registry:
+        registry.add(_ids(size, size))
+        keys = _stored_keys(path)
+        probes = sorted(keys + [global_id_key(g) for g in _ids(50, -1)] + [b'\x00' * 16, b'\xff' * 16])
+        lo = 0
+        for key in probes:
+            expected = next((i for i, k in enumerate(keys) if k >= key), len(keys))
+            assert registry._bisect(key) == expected
+            # galloping from the previous position gives the same answer
+            lo = registry._bisect(key, lo)
+            assert lo == expected
+
+
+def test_contains_many_matches_spellings(tmp_path):
+    path = str(tmp_path / 'delivered.reg')
+    gid = _ids(1, 3)[0]
+    with IdRegistry(path) as registry:
+        registry.add([gid, 'legacy-17'])
+        found = registry.contains_many([gid.upper(), f'{{{gid}}}', 'legacy-17', 'LEGACY-17', '', None])
+    assert found == {gid.upper(), f'{{{gid}}}', 'legacy-17'}
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'delivered.reg'
+    path.write_bytes(b'not a registry at all')
+    with pytest.raises(ValueError):
+        IdRegistry(str(path))
+
+
+def test_previously_delivered_pois_are_not_shipped(tmp_path, monkeypatch):
+    ids = _ids(6, 4)
+    source = tmp_path / 'pois.json'
+    source.write_text(json.dumps({'pois': [{'global_id': g, 'name_ar': f'POI {g}'} for g in ids]}),
+                      encoding='utf-8')
+    registry = str(tmp_path / 'delivered.reg')
+    with IdRegistry(registry) as reg:
+        reg.add([ids[1], ids[4]])
+
+    out = tmp_path / 'delivery'
+    monkeypatch.setattr(sys, 'argv', ['generate_delivery.py', '--input', str(source), '--output', str(out),
+                                      '--registry', registry, '--index', '--seed', '1'])
+    generate_delivery.main()
+
+    shipped = [ids[i] for i in (0, 2, 3, 5)]
+    export = json.loads((out / 'json' / 'naver_poi_delivery.json').read_text(encoding='utf-8'))
+    assert [p['global_id'] for p in export['pois']] == shipped
+    assert export['_meta']['total_records'] == 4
+    csv_text = (out / 'csv' / 'naver_poi_delivery.csv').read_text(encoding='utf-8')
+    assert [g for g in ids if g in csv_text] == shipped
+
+    billing = json.loads((out / 'billing_summary.json').read_text(encoding='utf-8'))
+    assert billing['delivery']['total_pois_delivered'] == 4
+    assert billing['delivery']['previously_delivered_pois'] == 2
+    assert [u['global_id'] for u in billing['unbillable']] == [ids[1], ids[4]]
@@ -0,0 +1,136 @@
+import json
+import os
+import re
+import sqlite3
+
+import pytest
+
+from kpi_rollups import build_kpi_rollups, kpi_batch_id, kpi_batch_rows, upsert_kpi_cache
+
+MIGRATE_JS = os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'src', 'db', 'migrate.js')
+
+
+def create_kpi_tables(path: str):
+    """Create kpi_cache and kpi_cache_batches from the SQLite DDL in migrate.js."""
+    with open(MIGRATE_JS, encoding='utf-8') as f:
+        source = f.read()
+    conn = sqlite3.connect(path)
+    for table in ('kpi_cache', 'kpi_cache_batches'):
+        conn.execute(re.search(rf'`(CREATE TABLE IF NOT EXISTS {table} \(.*?\))`', source, re.S).group(1))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / 'kpi.db')
+    create_kpi_tables(path)
+    return 'sqlite:///' + path
+
+
+def make_batch(prefix: str, days: dict, agent: str = 'agent1'):
+    """`days` maps YYYY-MM-DD -> (valid, invalid) POI counts."""
+    pois, results = [], []
+    for day, (valid, invalid) in days.items():
+        for i in range(valid + invalid):
+            pois.append({
+                'global_id': f'{prefix}-{day}-{i}', 'category': 'cafe', 'company_status': 'open',
+                'agent_name': agent, 'submitted_at': f'{day}T10:00:00Z',
+                'exterior_image_url': 'https://example.com/a.jpg' if i % 2 else '',
+            })
+            results.append({'is_valid': i < valid, 'completeness_pct': 80.0,
+                            'compliance_score': 50.0, 'errors': [] if i < valid else ['missing_field: x']})
+    return pois, results
+
+
+def upsert(url, batch, survey_id=None, batch_size=500):
+    pois, results = batch
+    rows = kpi_batch_rows(build_kpi_rollups(pois, results), kpi_batch_id(pois), survey_id)
+    return upsert_kpi_cache(url, rows, batch_size)
+
+
+def cache_rows(url):
+    conn = sqlite3.connect(url[len('sqlite:///'):])
+    conn.row_factory = sqlite3.Row
+    rows = [dict(r) for r in conn.execute(
+        'SELECT * FROM kpi_cache ORDER BY survey_id, period_type, period_start')]
+    conn.close()
+    for r in rows:
+        r.pop('id')
+        r.pop('computed_at')
+    return rows
+
+
+def by_key(url):
+    return {(r['survey_id'], r['period_type'], r['period_start']): r for r in cache_rows(url)}
+
+
+def test_first_batch_rows(db):
+    assert upsert(db, make_batch('a', {'2026-03-01': (8, 2), '2026-03-02': (5, 0)})) == 3
+    rows = by_key(db)
+    assert set(rows) == {(None, 'daily', '2026-03-01'), (None, 'daily', '2026-03-02'),
+                         (None, 'all_time', '2026-03-01')}
+    all_time = rows[(None, 'all_time', '2026-03-01')]
+    assert all_time['period_end'] == '2026-03-02'
+    assert all_time['total_responses'] == 15
+    assert all_time['unique_surveyors'] == 1
+    assert json.loads(all_time['agent_counts']) == {'agent1': 15}
+    assert all_time['missing_data_percentage'] == 20.0
+    assert rows[(None, 'daily', '2026-03-01')]['total_videos'] == 0
+
+
+def test_rerun_replaces_batch(db):
+    batch = make_batch('a', {'2026-03-01': (8, 2), '2026-03-02': (5, 0)})
+    upsert(db, batch)
+    first = cache_rows(db)
+    upsert(db, batch)
+    assert cache_rows(db) == first
+
+
+def test_rerun_drops_days_no_longer_in_batch(db):
+    pois, results = make_batch('a', {'2026-03-01': (2, 0), '2026-03-02': (3, 0)})
+    rows = kpi_batch_rows(build_kpi_rollups(pois, results), 'batch-1')
+    upsert_kpi_cache(db, rows)
+    pois, results = make_batch('a', {'2026-03-02': (3, 0)})
+    upsert_kpi_cache(db, kpi_batch_rows(build_kpi_rollups(pois, results), 'batch-1'))
+    rows = by_key(db)
+    assert set(rows) == {(None, 'daily', '2026-03-02'), (None, 'all_time', '2026-03-02')}
+    assert rows[(None, 'all_time', '2026-03-02')]['total_responses'] == 3
+
+
+def test_second_batch_adds_to_totals(db):
+    upsert(db, make_batch('a', {'2026-03-01': (2000, 0), '2026-03-02': (1000, 0)}))
+    upsert(db, make_batch('b', {'2026-02-28': (100, 0), '2026-03-02': (300, 100)}, agent='agent2'))
+    rows = by_key(db)
+    all_time = [r for k, r in rows.items() if k[1] == 'all_time']
+    assert len(all_time) == 1
+    assert all_time[0]['total_responses'] == 3500
+    assert (all_time[0]['period_start'], all_time[0]['period_end']) == ('2026-02-28', '2026-03-02')
+    assert all_time[0]['unique_surveyors'] == 2
+    assert rows[(None, 'daily', '2026-03-01')]['total_responses'] == 2000
+    overlap = rows[(None, 'daily', '2026-03-02')]
+    assert overlap['total_responses'] == 1400
+    assert json.loads(overlap['agent_counts']) == {'agent1': 1000, 'agent2': 400}
+    assert rows[(None, 'daily', '2026-02-28')]['total_responses'] == 100
+
+
+def test_null_and_explicit_survey_ids_are_separate(db):
+    batch = make_batch('a', {'2026-03-01': (4, 1)})
+    upsert(db, batch)
+    upsert(db, batch, survey_id='survey-1')
+    upsert(db, batch)
+    upsert(db, batch, survey_id='survey-1')
+    rows = cache_rows(db)
+    assert sorted((r['survey_id'] or '', r['period_type']) for r in rows) == [
+        ('', 'all_time'), ('', 'daily'), ('survey-1', 'all_time'), ('survey-1', 'daily')]
+    assert all(r['total_responses'] == 5 for r in rows)
+
+
+def test_batch_size_does_not_change_rows(db, tmp_path):
+    days = {f'2026-03-{d:02d}': (d, d % 3) for d in range(1, 21)}
+    assert upsert(db, make_batch('a', days), batch_size=500) == 21
+
+    other = tmp_path / 'other.db'
+    create_kpi_tables(str(other))
+    assert upsert('sqlite:///' + str(other), make_batch('a', days), batch_size=3) == 21
+    assert cache_rows(db) == cache_rows('sqlite:///' + str(other))
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from media_package import MANIFEST_FILE, package_media
+
+PHOTO = b'\xff\xd8\xff\xe0 shop front' * 100
+VIDEO = b'\x00\x00\x00\x18ftypmp42 walkthrough' * 100
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        super().do_GET()
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / 'www'
+    root.mkdir()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(_Handler, directory=str(root)))
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield root, f'http://127.0.0.1:{httpd.server_address[1]}', httpd.requests
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def local(tmp_path):
+    root = tmp_path / 'photos'
+    root.mkdir()
+    return root
+
+
+def test_same_bytes_stored_once(server, local, tmp_path):
+    www, url, _ = server
+    (www / 'front.jpg').write_bytes(PHOTO)
+    (local / 'front.jpeg').write_bytes(PHOTO)
+    (local / 'front').write_bytes(PHOTO)
+    pois = [
+        {'global_id': 'poi-1', 'exterior_image_url': f'{url}/front.jpg', 'interior_image_url': 'front.jpeg'},
+        {'global_id': 'poi-2', 'exterior_image_url': 'front'},
+    ]
+    media = tmp_path / 'media'
+    manifest = package_media(pois, str(media), str(local), workers=4)
+
+    objects = [os.path.join(d, f) for d, _, fs in os.walk(media / 'objects') for f in fs]
+    assert len(objects) == 1
+    assert os.path.basename(objects[0]) == hashlib.sha256(PHOTO).hexdigest()
+    assert manifest['summary']['unique_objects'] == 1
+    assert manifest['summary']['stored_bytes'] == len(PHOTO)
+    assert manifest['summary']['referenced_bytes'] == 3 * len(PHOTO)
+
+    links = [media / 'poi-1' / 'exterior_image_url.jpg', media / 'poi-1' / 'interior_image_url.jpeg',
+             media / 'poi-2' / 'exterior_image_url.bin']
+    for link in links:
+        assert link.read_bytes() == PHOTO
+        assert os.path.samefile(link, objects[0])
+
+
+def test_manifest_contents(server, local, tmp_path):
+    www, url, _ = server
+    (www / 'front.jpg').write_bytes(PHOTO)
+    (www / 'tour.mp4').write_bytes(VIDEO)
+    pois = [{'global_id': 'poi-1', 'exterior_image_url': f'{url}/front.jpg',
+             'walkthrough_video_url': f'{url}/tour.mp4', 'menu_image_url': 'N/A'}]
+    media = tmp_path / 'media'
+    package_media(pois, str(media), str(local))
+
+    with open(media / MANIFEST_FILE, encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['summary'] == {
+        'references': 2, 'linked_files': 2, 'unique_objects': 2,
+        'stored_bytes': len(PHOTO) + len(VIDEO), 'referenced_bytes': len(PHOTO) + len(VIDEO),
+        'failed_references': 0,
+    }
+    assert manifest['failed'] == []
+    assert manifest['files'] == {'poi-1': [
+        {'field': 'exterior_image_url', 'file': os.path.join('poi-1', 'exterior_image_url.jpg'),
+         'source': f'{url}/front.jpg', 'sha256': hashlib.sha256(PHOTO).hexdigest(), 'bytes': len(PHOTO)},
+        {'field': 'walkthrough_video_url', 'file': os.path.join('poi-1', 'walkthrough_video_url.mp4'),
+         'source': f'{url}/tour.mp4', 'sha256': hashlib.sha256(VIDEO).hexdigest(), 'bytes': len(VIDEO)},
+    ]}
+    assert not os.path.exists(media / '.media_journal.ndjson')
+
+
+def test_404_recorded_and_rerun_fetches_only_failed(server, local, tmp_path):
+    www, url, requests = server
+    (www / 'front.jpg').write_bytes(PHOTO)
+    pois = [{'global_id': 'poi-1', 'exterior_image_url': f'{url}/front.jpg',
+             'walkthrough_video_url': f'{url}/tour.mp4'}]
+    media = tmp_path / 'media'
+
+    manifest = package_media(pois, str(media), str(local))
+    assert manifest['summary']['failed_references'] == 1
+    [failure] = manifest['failed']
+    assert failure['global_id'] == 'poi-1'
+    assert failure['field'] == 'walkthrough_video_url'
+    assert failure['source'] == f'{url}/tour.mp4'
+    assert '404' in failure['error']
+    assert os.path.exists(media / '.media_journal.ndjson')
+
+    (www / 'tour.mp4').write_bytes(VIDEO)
+    requests.clear()
+    manifest = package_media(pois, str(media), str(local))
+    assert requests == ['/tour.mp4']
+    assert manifest['failed'] == []
+    assert manifest['summary']['linked_files'] == 2
+    assert (media / 'poi-1' / 'walkthrough_video_url.mp4').read_bytes() == VIDEO
+
+
+def test_local_sources_confined_to_media_root(local, tmp_path):
+    (local / 'front.jpg').write_bytes(PHOTO)
+    secret = tmp_path / 'secret.jpg'
+    secret.write_bytes(b'not media')
+    os.symlink(secret, local / 'link.jpg')
+    pois = [{'global_id': 'poi-1', 'exterior_image_url': (local / 'front.jpg').as_uri(),
+             'interior_image_url': '../secret.jpg', 'entrance_image_url': str(secret),
+             'menu_image_url': secret.as_uri(), 'walkthrough_video_url': 'link.jpg'}]
+    media = tmp_path / 'media'
+
+    manifest = package_media(pois, str(media), str(local))
+    assert [f['field'] for f in manifest['files']['poi-1']] == ['exterior_image_url']
+    assert len(manifest['failed']) == 4
+    assert all('source_outside_media_root' in f['error'] for f in manifest['failed'])
+
+
+def test_sanitized_global_ids_do_not_collide(local, tmp_path):
+    (local / 'a.jpg').write_bytes(PHOTO)
+    (local / 'b.jpg').write_bytes(VIDEO)
+    pois = [{'global_id': 'a/b', 'exterior_image_url': 'a.jpg'},
+            {'global_id': 'a_b', 'exterior_image_url': 'b.jpg'},
+            {'global_id': '..', 'exterior_image_url': 'a.jpg'}]
+    media = tmp_path / 'media'
+
+    manifest = package_media(pois, str(media), str(local))
+    folders = {gid: os.path.dirname(v[0]['file']) for gid, v in manifest['files'].items()}
+    assert folders['a_b'] == 'a_b'
+    assert len(set(folders.values())) == 3
+    assert (media / folders['a/b'] / 'exterior_image_url.jpg').read_bytes() == PHOTO
+    assert (media / 'a_b' / 'exterior_image_url.jpg').read_bytes() == VIDEO
+    assert os.path.dirname(os.path.realpath(media / folders['..'])) == os.path.realpath(media)
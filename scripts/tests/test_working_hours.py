@@ -0,0 +1,137 @@
+import csv
+import json
+
+import pytest
+
+from validate import load_csv
+from working_hours import (
+    SLOTS_PER_DAY, SLOT_MINUTES, ScheduleError, ScheduleIndex, parse_days, parse_poi_schedule,
+    parse_ranges, parse_slot, parse_time, parse_window,
+)
+
+SUN, MON, TUE, WED, THU, FRI, SAT = range(7)
+
+
+def _open(mask, day, clock):
+    slot = day * SLOTS_PER_DAY + parse_time(clock) // SLOT_MINUTES
+    return bool(mask >> slot & 1)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('All Days (7 days)', set(range(7))),
+    ('Sunday-Thursday', {SUN, MON, TUE, WED, THU}),
+    ('Thursday - Sunday', {THU, FRI, SAT, SUN}),
+    ('Sat, Sun, Mon', {SAT, SUN, MON}),
+    ('Tues. and Thurs', {TUE, THU}),
+    ('الأحد - الخميس', {SUN, MON, TUE, WED, THU}),
+    ('السبت، الأحد', {SAT, SUN}),
+    (['Friday', 'saturday'], {FRI, SAT}),
+])
+def test_parse_days(value, expected):
+    assert parse_days(value) == expected
+
+
+@pytest.mark.parametrize('value', ['', 'Someday', 'Mon-Tue-Wed', 42])
+def test_parse_days_rejects(value):
+    with pytest.raises(ScheduleError):
+        parse_days(value)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('6 AM - 12 AM', [(360, 1440)]),
+    ('09:00-23:00', [(540, 1380)]),
+    ('9 AM - 1 PM, 4 PM - 11 PM', [(540, 780), (960, 1380)]),
+    ('24 hours', [(0, 1440)]),
+    ('Closed', []),
+    ('noon to midnight', [(720, 1440)]),
+    ('8 ص - 10 م', [(480, 1320)]),
+    # a bare start hour takes the end's AM/PM when that keeps the range in one day
+    ('1 - 2 PM', [(780, 840)]),
+    ('9-5 PM', [(540, 1020)]),
+    ('11-2 PM', [(660, 840)]),
+    ('7:30-10 PM', [(1170, 1320)]),
+    # past midnight
+    ('10 PM - 2 AM', [(1320, 1560)]),
+    ('18:00-02:00', [(1080, 1560)]),
+])
+def test_parse_ranges(value, expected):
+    assert parse_ranges(value) == expected
+
+
+@pytest.mark.parametrize('value', ['9 AM', '13 PM - 2 PM', '9:75-10:00', '25:00-26:00', 'soon'])
+def test_parse_ranges_rejects(value):
+    with pytest.raises(ScheduleError):
+        parse_ranges(value)
+
+
+@pytest.mark.parametrize('poi, open_at, closed_at', [
+    ({'working_days': 'Sunday-Thursday', 'working_hours': '9 AM - 5 PM', 'break_times': '1 - 2 PM'},
+     [(SUN, '09:00'), (THU, '16:45'), (MON, '14:00')],
+     [(SUN, '13:00'), (SUN, '13:45'), (FRI, '10:00'), (MON, '17:00')]),
+    ({'working_days': 'Friday', 'working_hours': '10 PM - 2 AM', 'break_times': '1 AM - 1:30 AM'},
+     [(FRI, '22:00'), (SAT, '00:30'), (SAT, '01:30')],
+     [(SAT, '01:00'), (SAT, '01:15'), (SAT, '02:00'), (FRI, '01:00')]),
+    ({'working_days': 'Saturday', 'working_hours': '8 PM - 4 AM'},
+     [(SAT, '23:45'), (SUN, '03:45')],
+     [(SUN, '04:00'), (SAT, '03:00')]),
+    ({'working_days': ['sunday', 'monday'],
+      'working_hours': {'sunday': '9:00-17:00', 'monday': '10:00-14:00'},
+      'break_times': {'sunday': '12:00-12:30'}},
+     [(SUN, '09:00'), (SUN, '12:30'), (MON, '13:45')],
+     [(SUN, '12:15'), (MON, '14:00'), (TUE, '10:00')]),
+    ({'working_days': 'All Days', 'working_hours': '24 hours', 'break_times': 'No Break'},
+     [(SUN, '00:00'), (SAT, '23:45')], []),
+])
+def test_poi_schedule(poi, open_at, closed_at):
+    mask, errors = parse_poi_schedule(poi)
+    assert errors == []
+    assert [_open(mask, d, t) for d, t in open_at] == [True] * len(open_at)
+    assert [_open(mask, d, t) for d, t in closed_at] == [False] * len(closed_at)
+
+
+@pytest.mark.parametrize('poi, error', [
+    ({'working_days': 'Funday', 'working_hours': '9-17'}, 'working_days_unparseable'),
+    ({'working_hours': 'whenever'}, 'working_hours_unparseable'),
+    ({'working_hours': '9 AM - 5 PM', 'break_times': 'lunch'}, 'break_times_unparseable'),
+    ({'working_hours': '9 AM - 5 PM', 'break_times': '6 PM - 7 PM'}, 'break_outside_working_hours'),
+    ({'working_days': 'Friday', 'working_hours': '10 PM - 2 AM', 'break_times': '3 AM - 4 AM'},
+     'break_outside_working_hours'),
+    ({'working_days': 'Sunday-Thursday', 'working_hours': {'friday': '9:00-17:00'}},
+     'working_days_hours_mismatch'),
+])
+def test_poi_schedule_errors(poi, error):
+    mask, errors = parse_poi_schedule(poi)
+    assert mask is None
+    assert [e.split(':')[0] for e in errors] == [error]
+
+
+def test_json_per_day_from_csv(tmp_path):
+    path = tmp_path / 'pois.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['global_id', 'working_days', 'working_hours'])
+        writer.writerow(['ok', 'Sunday', json.dumps({'sunday': '9:00-17:00'})])
+        writer.writerow(['mismatch', 'Sunday-Thursday', json.dumps({'friday': '9:00-17:00'})])
+        writer.writerow(['broken', 'Sunday', '{"sunday": '])
+    ok, mismatch, broken = load_csv(str(path))
+
+    mask, errors = parse_poi_schedule(ok)
+    assert errors == [] and _open(mask, SUN, '10:00') and not _open(mask, MON, '10:00')
+    assert parse_poi_schedule(mismatch) == (None, ['working_days_hours_mismatch'])
+    assert parse_poi_schedule(broken)[1][0].startswith('working_hours_unparseable')
+
+
+def test_schedule_index():
+    pois = [
+        {'global_id': 'day', 'working_hours': '9 AM - 5 PM'},
+        {'global_id': 'day-2', 'working_hours': '09:00-17:00'},
+        {'global_id': 'night', 'working_days': 'Friday', 'working_hours': '10 PM - 2 AM'},
+        {'global_id': 'bad', 'working_hours': 'sometimes'},
+    ]
+    index = ScheduleIndex(pois)
+    assert len(index.groups) == 2
+    assert index.unparsed == ['bad']
+    assert sorted(index.open_at(parse_slot('monday 10:00'))) == ['day', 'day-2']
+    assert index.open_at(parse_slot('saturday 01:00')) == ['night']
+    assert sorted(index.open_during(parse_window('friday 16:00-23:00'))) == []
+    assert sorted(index.open_during(parse_window('friday 16:00-23:00'), any_time=True)) == ['day', 'day-2', 'night']
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+NAVER POI Tile Aggregates
+==========================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Bins validated POIs into a Web Mercator (z/x/y, the Leaflet/OSM scheme)
+tile pyramid so map and KPI dashboards can load per-tile summaries instead
+of raw points. Points are binned once at the deepest zoom; every shallower
+zoom is rolled up from its four child tiles.
+
+Output (compact JSON):
+    {
+      "zooms": [min_zoom, max_zoom],
+      "columns": ["count", "valid", "invalid", "mean_completeness_pct", "top_errors"],
+      "tiles": {"<z>": {"<x>/<y>": [count, valid, invalid, mean, {code: n}]}},
+      "unplaced_pois": n
+    }
+
+Usage:
+    python tile_aggregates.py --input data.json --output tile_aggregates.json
+"""
+
+import argparse
+import json
+import math
+
+MIN_ZOOM = 4
+MAX_ZOOM = 14
+TOP_ERRORS = 3
+MERCATOR_LAT_LIMIT = 85.05112878
+
+
+def tile_for(lat: float, lon: float, zoom: int):
+    """Return the (x, y) Web Mercator tile containing a WGS84 point."""
+    n = 1 << zoom
+    lat = max(-MERCATOR_LAT_LIMIT, min(MERCATOR_LAT_LIMIT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _error_code(error: str) -> str:
+    return error.split(':')[0] if ':' in error else error
+
+
+def aggregate_tiles(pois: list, results: list, min_zoom: int = MIN_ZOOM,
+                    max_zoom: int = MAX_ZOOM) -> dict:
+    """Aggregate POIs and their validation results into a tile pyramid."""
+    # tile -> [count, valid, completeness_sum, {error_code: count}]
+    level = {}
+    unplaced = 0
+    for poi, r in zip(pois, results):
+        try:
+            lat, lon = float(poi.get('latitude')), float(poi.get('longitude'))
+        except (TypeError, ValueError):
+            unplaced += 1
+            continue
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            unplaced += 1
+            continue
+        tile = tile_for(lat, lon, max_zoom)
+        acc = level.get(tile)
+        if acc is None:
+            acc = level[tile] = [0, 0, 0.0, {}]
+        acc[0] += 1
+        acc[1] += r['is_valid']
+        acc[2] += r['completeness_pct']
+        for e in r['errors']:
+            code = _error_code(e)
+            acc[3][code] = acc[3].get(code, 0) + 1
+
+    pyramid = {}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        pyramid[zoom] = level
+        parent = {}
+        for (x, y), acc in level.items():
+            p = parent.get((x >> 1, y >> 1))
+            if p is None:
+                parent[(x >> 1, y >> 1)] = [acc[0], acc[1], acc[2], dict(acc[3])]
+                continue
+            p[0] += acc[0]
+            p[1] += acc[1]
+            p[2] += acc[2]
+            for code, n in acc[3].items():
+                p[3][code] = p[3].get(code, 0) + n
+        level = parent
+
+    tiles = {}
+    for zoom in sorted(pyramid):
+        tiles[str(zoom)] = {
+            f'{x}/{y}': [
+                count, valid, count - valid, round(comp_sum / count, 2),
+                dict(sorted(errs.items(), key=lambda e: (-e[1], e[0]))[:TOP_ERRORS]),
+            ]
+            for (x, y), (count, valid, comp_sum, errs) in sorted(pyramid[zoom].items())
+        }
+
+    return {
+        'zooms': [min_zoom, max_zoom],
+        'columns': ['count', 'valid', 'invalid', 'mean_completeness_pct', 'top_errors'],
+        'tiles': tiles,
+        'unplaced_pois': unplaced,
+    }
+
+
+def write_tile_aggregates(aggregates: dict, output_path: str):
+    """Write tile aggregates as compact JSON."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(aggregates, f, ensure_ascii=False, separators=(',', ':'))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    from validate import load_csv, load_json, validate_poi
+
+    parser = argparse.ArgumentParser(description='NAVER POI Tile Aggregates')
+    parser.add_argument('--input', '-i', required=True, help='Input data file (JSON or CSV)')
+    parser.add_argument('--output', '-o', default='tile_aggregates.json', help='Output file')
+    parser.add_argument('--min-zoom', type=int, default=MIN_ZOOM)
+    parser.add_argument('--max-zoom', type=int, default=MAX_ZOOM)
+    args = parser.parse_args()
+
+    if not 0 <= args.min_zoom <= args.max_zoom:
+        parser.error('zoom range must satisfy 0 <= --min-zoom <= --max-zoom')
+
+    pois = load_csv(args.input) if args.input.lower().endswith('.csv') else load_json(args.input)
+    results = [validate_poi(poi, i) for i, poi in enumerate(pois)]
+    aggregates = aggregate_tiles(pois, results, args.min_zoom, args.max_zoom)
+    write_tile_aggregates(aggregates, args.output)
+    print(f'Tile aggregates: {args.output} '
+          f'({sum(len(t) for t in aggregates["tiles"].values())} tiles, '
+          f'{aggregates["unplaced_pois"]} unplaced POIs)')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,17 +12,26 @@ Validates POI data against contractual requirements:
 - Boolean strict validation (true/false only)
 - Category lowercase enforcement
 - KSA phone format validation
-- Working hours structure validation
-- 30% QA sampling with accuracy KPI
+- Working hours structure validation (days / hours / breaks parsed to a weekly bitmask)
+- 30% QA sampling with accuracy KPI (and the exact probability of each decision)
 - Budget cap enforcement (SAR 50,000)
+- Cross-delivery global_id uniqueness (delivered-ID registry)
+- SAR-weighted compliance score (same field weights as the portal backend)
 
 Usage:
     python validate.py --input data.json --output reports/
     python validate.py --input data.csv --output reports/ --format csv
+    python validate.py --input data.ndjson --output reports/
+    python validate.py --input data.json --output reports/ --registry delivered_ids.reg
+    python validate.py --input data.json --output reports/ --qa-strata category --seed 42
+    python validate.py --input data.json --output reports/ --kpi-db sqlite:///backend/data/kpi.db
+    python validate.py --input data.json --output reports/ --resume
+    python validate.py --input deliveries/ 'agents/*.csv' --output reports/ --dedup first-wins
 """
 
 import argparse
 import csv
+import glob
 import json
 import math
 import os
@@ -30,9 +39,18 @@ import random
 import re
 import sys
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
+from compliance import ComplianceEngine
+from delivery_index import global_id_key
+from id_registry import IdRegistry
+from ndjson_io import NDJSON_EXTENSIONS, load_ndjson
+from qa_probability import DEFAULT_QA_TRIALS, simple_decision_report, stratified_decision_report
+from checkpoint import CheckpointError, RunCheckpoint, DEFAULT_CHECKPOINT_EVERY, input_fingerprint
+from working_hours import parse_poi_schedule
+
 # ─── Contract Constants ──────────────────────────────────────────────────────
 PILOT_BUDGET_CAP = 50000.0     # SAR
 UNIT_PRICE_POI = 52.2          # SAR per POI
@@ -40,6 +58,7 @@ VIDEO_COST = 15.0              # SAR per walkthrough video
 SAMPLING_RATE = 0.30           # 30%
 KPI_ACCEPT_THRESHOLD = 95.0    # ≥95% → ACCEPT
 KPI_CORRECT_THRESHOLD = 90.0   # 90-94% → REQUIRE CORRECTION
+PREVIOUSLY_DELIVERED = 'global_id_previously_delivered'
 COORDINATE_TOLERANCE_M = 30.0  # meters
 
 # KSA bounding box (WGS84)
@@ -240,6 +259,7 @@ def validate_poi(poi: dict, index: int) -> dict:
     wh = poi.get('working_hours')
     if not validate_working_hours(wh):
         errors.append('working_hours_invalid_or_empty')
+    errors.extend(parse_poi_schedule(poi)[1])
 
     # 9. Payment methods validation
     pm = poi.get('accepted_payment_methods')
@@ -306,13 +326,26 @@ def check_coordinate_tolerance(poi, reference_lat, reference_lon):
 # QA SAMPLING & KPI
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def qa_sample_and_calculate_kpi(results: list) -> dict:
+def qa_decision(valid_in_sample: int, sample_size: int) -> str:
+    """Contract decision for a QA sample with `valid_in_sample` valid POIs."""
+    accuracy = round((valid_in_sample / sample_size) * 100, 2) if sample_size else 0
+    if accuracy >= KPI_ACCEPT_THRESHOLD:
+        return 'ACCEPT'
+    if accuracy >= KPI_CORRECT_THRESHOLD:
+        return 'REQUIRE_CORRECTION'
+    return 'REQUIRE_RESURVEY'
+
+
+def qa_sample_and_calculate_kpi(results: list, pois: list = None, stratify_by: str = None,
+                                trials: int = DEFAULT_QA_TRIALS, seed=None) -> dict:
     """
     Randomly sample 30% of POIs and calculate accuracy KPI.
     Contract logic:
       ≥95% → ACCEPT
       90-94% → REQUIRE CORRECTION
       <90% → REQUIRE RESURVEY
+    Also reports the exact probability of each decision over all possible
+    samples and, with `stratify_by`, for 30% of every stratum of that field.
     """
     total = len(results)
     sample_size = max(1, int(math.ceil(total * SAMPLING_RATE)))
@@ -320,15 +353,9 @@ def qa_sample_and_calculate_kpi(results: list) -> dict:
 
     valid_in_sample = sum(1 for r in sampled if r['is_valid'])
     accuracy = round((valid_in_sample / len(sampled)) * 100, 2) if sampled else 0
+    decision = qa_decision(valid_in_sample, len(sampled))
 
-    if accuracy >= KPI_ACCEPT_THRESHOLD:
-        decision = 'ACCEPT'
-    elif accuracy >= KPI_CORRECT_THRESHOLD:
-        decision = 'REQUIRE_CORRECTION'
-    else:
-        decision = 'REQUIRE_RESURVEY'
-
-    return {
+    kpi = {
         'total_pois': total,
         'sample_size': len(sampled),
         'sampling_rate_pct': SAMPLING_RATE * 100,
@@ -342,23 +369,43 @@ def qa_sample_and_calculate_kpi(results: list) -> dict:
             'REQUIRE_CORRECTION': f'{KPI_CORRECT_THRESHOLD}% - {KPI_ACCEPT_THRESHOLD - 0.01}%',
             'REQUIRE_RESURVEY': f'< {KPI_CORRECT_THRESHOLD}%',
         },
-        'sampled_poi_ids': [r['poi_id'] for r in sampled],
     }
+    if total:
+        invalid = sum(1 for r in results if not r['is_valid'])
+        kpi['decision_probability'] = simple_decision_report(total, invalid, len(sampled), qa_decision)
+    if total and stratify_by:
+        strata = {}
+        for poi, r in zip(pois, results):
+            key = str(poi.get(stratify_by) or 'unknown').strip().lower() or 'unknown'
+            n, bad = strata.get(key, (0, 0))
+            strata[key] = (n + 1, bad + (not r['is_valid']))
+        kpi['stratified_decision_probability'] = {
+            'stratified_by': stratify_by,
+            **stratified_decision_report(strata, SAMPLING_RATE, qa_decision, trials, seed),
+        }
+    kpi['sampled_poi_ids'] = [r['poi_id'] for r in sampled]
+    return kpi
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # BILLING / BUDGET ENGINE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def calculate_billing(pois: list) -> dict:
+def calculate_billing(pois: list, results: list = None) -> dict:
     """
     Calculate billing per pilot agreement:
     - 52.2 SAR per valid POI
     - 15 SAR per walkthrough video
     - Budget cap: SAR 50,000
+    - POIs already delivered in an earlier batch (registry check) are not billed
+      again, and generate_delivery leaves them out of the package
     """
-    total_pois = len(pois)
-    pois_with_video = sum(1 for p in pois if is_filled(p.get('walkthrough_video_url')))
+    repeated = [] if results is None else [
+        i for i, r in enumerate(results) if PREVIOUSLY_DELIVERED in r['errors']]
+    skip = set(repeated)
+    billable = [p for i, p in enumerate(pois) if i not in skip]
+    total_pois = len(billable)
+    pois_with_video = sum(1 for p in billable if is_filled(p.get('walkthrough_video_url')))
 
     poi_cost = total_pois * UNIT_PRICE_POI
     video_cost = pois_with_video * VIDEO_COST
@@ -377,6 +424,8 @@ def calculate_billing(pois: list) -> dict:
         },
         'delivery': {
             'total_pois_delivered': total_pois,
+            'previously_delivered_pois': len(repeated),
+            'billable_pois': total_pois,
             'pois_with_video': pois_with_video,
             'pois_without_video': total_pois - pois_with_video,
         },
@@ -389,6 +438,9 @@ def calculate_billing(pois: list) -> dict:
             'over_budget': over_budget,
             'max_pois_within_budget': max_pois_in_budget,
         },
+        'unbillable': [
+            {'global_id': pois[i].get('global_id'), 'reason': PREVIOUSLY_DELIVERED} for i in repeated
+        ],
         'generated_at': datetime.now(timezone.utc).isoformat(),
     }
 
@@ -441,16 +493,160 @@ def load_csv(filepath):
     return pois
 
 
+INPUT_EXTENSIONS = ('.json', '.csv', *NDJSON_EXTENSIONS)
+INPUT_FORMATS = ['json', 'ndjson', 'csv']
+DEDUP_POLICIES = ('last-wins', 'first-wins')
+
+
+def detect_format(filepath, fmt=None):
+    """Input format for a file: explicit `fmt`, else by extension."""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    return 'ndjson' if ext in NDJSON_EXTENSIONS else 'json'
+
+
+def expand_inputs(specs: list) -> list:
+    """
+    Expand input files, directories and glob patterns into a sorted,
+    de-duplicated list of data files. Directories contribute their
+    JSON/CSV files (non-recursive). Raises FileNotFoundError naming every
+    spec that matches no file, so a mistyped pattern cannot silently
+    shrink the delivery.
+    """
+    files = []
+    unmatched = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            matches = [os.path.join(spec, n) for n in os.listdir(spec)
+                       if n.lower().endswith(INPUT_EXTENSIONS)]
+        elif glob.has_magic(spec):
+            matches = glob.glob(spec, recursive=True)
+        else:
+            matches = [spec] if os.path.exists(spec) else []
+        matches = sorted(m for m in matches if not os.path.isdir(m))
+        if not matches:
+            unmatched.append(spec)
+        files.extend(matches)
+    if unmatched:
+        raise FileNotFoundError(f'no input files match: {", ".join(unmatched)}')
+    return list(dict.fromkeys(files))
+
+
+def load_file(filepath, fmt=None, workers=None):
+    """Load POI data from one file with load_json / load_ndjson / load_csv semantics."""
+    fmt = detect_format(filepath, fmt)
+    if fmt == 'csv':
+        return load_csv(filepath)
+    if fmt == 'ndjson':
+        return load_ndjson(filepath, workers)
+    return load_json(filepath)
+
+
+def load_inputs(files: list, fmt=None, workers=None) -> list:
+    """
+    Load several files concurrently across worker processes.
+    Returns [(filepath, pois)] in the order of `files`.
+    """
+    if len(files) == 1 or workers == 1:
+        return [(f, load_file(f, fmt, workers)) for f in files]
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(zip(files, pool.map(load_file, files, [fmt] * len(files), [1] * len(files))))
+
+
+def merge_pois(loaded: list, policy: str = 'last-wins'):
+    """
+    Merge per-file POI lists in file order, resolving duplicate global_ids.
+    'first-wins' keeps the earliest record, 'last-wins' the latest; kept
+    records stay at their own position. Records without a global_id are
+    always kept. global_ids match as the delivery index and registry match
+    them (delivery_index.global_id_key). Returns (pois, duplicates_report).
+    """
+    records = [(path, i, poi) for path, pois in loaded for i, poi in enumerate(pois)]
+    winners = {}
+    occurrences = {}
+    names = {}
+    for pos, (_, _, poi) in enumerate(records):
+        gid = poi.get('global_id') if isinstance(poi, dict) else None
+        if not is_filled(gid):
+            continue
+        key = global_id_key(gid)
+        names.setdefault(key, str(gid).strip())
+        occurrences.setdefault(key, []).append(pos)
+        if policy == 'last-wins' or key not in winners:
+            winners[key] = pos
+
+    kept = set(winners.values())
+    duplicates = {}
+    for key, positions in occurrences.items():
+        if len(positions) > 1:
+            duplicates[names[key]] = [
+                {'source': records[p][0], 'index': records[p][1], 'kept': p in kept}
+                for p in positions
+            ]
+    pois = [poi for pos, (_, _, poi) in enumerate(records)
+            if pos in kept or not isinstance(poi, dict) or not is_filled(poi.get('global_id'))]
+
+    return pois, {
+        'policy': policy,
+        'input_files': [path for path, _ in loaded],
+        'total_records': len(records),
+        'merged_records': len(pois),
+        'duplicate_global_ids': len(duplicates),
+        'dropped_records': len(records) - len(pois),
+        'duplicates': duplicates,
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # REPORT GENERATORS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def previously_delivered(pois: list, registry_path: str) -> set:
+    """Indexes of POIs whose global_id is already in the delivered-ID registry."""
+    with IdRegistry(registry_path) as registry:
+        delivered = registry.contains_many(
+            poi.get('global_id') for poi in pois if is_filled(poi.get('global_id')))
+    return {i for i, poi in enumerate(pois)
+            if is_filled(poi.get('global_id')) and poi.get('global_id') in delivered}
+
+
+def flag_previously_delivered(results: list, repeated: set) -> int:
+    """Mark the results at `repeated` indexes as previously delivered."""
+    for i in repeated:
+        results[i]['errors'].append(PREVIOUSLY_DELIVERED)
+        results[i]['is_valid'] = False
+    return len(repeated)
+
+
+def apply_registry_check(pois: list, results: list, registry_path: str) -> int:
+    """
+    Flag POIs whose global_id is already in the delivered-ID registry.
+    Returns the number of results flagged.
+    """
+    return flag_previously_delivered(results, previously_delivered(pois, registry_path))
+
+
+def apply_compliance_scores(pois: list, results: list, engine=None):
+    """Attach the portal's SAR-weighted compliance score to each validation result."""
+    engine = engine or ComplianceEngine()
+    for r, c in zip(results, engine.score_pois(pois)):
+        r['compliance_score'] = c['score']
+        r['earned_sar'] = c['earnedSAR']
+        r['applicable_sar'] = c['applicableSAR']
+
+
 def generate_validation_report(results: list) -> dict:
     """Generate full validation report."""
     total = len(results)
     valid = sum(1 for r in results if r['is_valid'])
     invalid = total - valid
     avg_completeness = round(sum(r['completeness_pct'] for r in results) / total, 2) if total else 0
+    avg_compliance = round(sum(r.get('compliance_score', 0) for r in results) / total, 2) if total else 0
+    earned_sar = round(sum(r.get('earned_sar', 0) for r in results), 2)
 
     # Error frequency
     error_freq = {}
@@ -479,6 +675,8 @@ def generate_validation_report(results: list) -> dict:
             'invalid_pois': invalid,
             'accuracy_pct': round((valid / total) * 100, 2) if total else 0,
             'avg_completeness_pct': avg_completeness,
+            'avg_compliance_score': avg_compliance,
+            'earned_sar_total': earned_sar,
         },
         'error_frequency': dict(sorted(error_freq.items(), key=lambda x: -x[1])),
         'warning_frequency': dict(sorted(warning_freq.items(), key=lambda x: -x[1])),
@@ -494,6 +692,7 @@ def generate_completeness_csv(results: list, output_path: str):
             'poi_id', 'is_valid', 'completeness_pct',
             'filled_fields', 'total_fields',
             'error_count', 'warning_count', 'errors',
+            'compliance_score', 'earned_sar', 'applicable_sar',
         ])
         for r in results:
             writer.writerow([
@@ -505,6 +704,9 @@ def generate_completeness_csv(results: list, output_path: str):
                 len(r['errors']),
                 len(r['warnings']),
                 '; '.join(r['errors']) if r['errors'] else '',
+                r.get('compliance_score', ''),
+                r.get('earned_sar', ''),
+                r.get('applicable_sar', ''),
             ])
 
 
@@ -513,47 +715,100 @@ def generate_completeness_csv(results: list, output_path: str):
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def main():
+    # kpi_rollups imports is_filled from this module
+    from kpi_rollups import (
+        DEFAULT_BATCH_SIZE, build_kpi_rollups, generate_rollup_report, kpi_batch_id, kpi_batch_rows,
+        upsert_kpi_cache,
+    )
+
     parser = argparse.ArgumentParser(
         description='NAVER POI Data Validation Engine — Farq Technology'
     )
-    parser.add_argument('--input', '-i', required=True, help='Input data file (JSON or CSV)')
+    parser.add_argument('--input', '-i', required=True, nargs='+',
+                        help='Input data files, directories or glob patterns (JSON, NDJSON or CSV)')
     parser.add_argument('--output', '-o', default='./reports', help='Output directory for reports')
-    parser.add_argument('--format', '-f', choices=['json', 'csv'], default=None,
+    parser.add_argument('--format', '-f', choices=INPUT_FORMATS, default=None,
                         help='Input format (auto-detected from extension if omitted)')
     parser.add_argument('--seed', type=int, default=None, help='Random seed for QA sampling reproducibility')
+    parser.add_argument('--qa-strata', default=None, metavar='FIELD',
+                        help='Also report QA decision odds for a 30%% sample of every FIELD value')
+    parser.add_argument('--qa-trials', type=int, default=DEFAULT_QA_TRIALS,
+                        help='Monte Carlo samples for the stratified QA odds')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for loading multiple files (default: one per CPU)')
+    parser.add_argument('--dedup', choices=DEDUP_POLICIES, default='last-wins',
+                        help='Which record to keep when a global_id appears more than once')
+    parser.add_argument('--registry', default=None,
+                        help='Delivered global_id registry; IDs found in it are flagged as errors')
+    parser.add_argument('--kpi-db', default=None,
+                        help='Upsert KPI rollups into kpi_cache (sqlite:///path.db or postgresql://...)')
+    parser.add_argument('--survey-id', default=None, help='survey_id for kpi_cache rows')
+    parser.add_argument('--kpi-agent', default=None,
+                        help='Agent for KPI rollups when records carry no agent field (the delivery schema has none)')
+    parser.add_argument('--kpi-day', default=None, metavar='YYYY-MM-DD',
+                        help='Survey day for KPI rollups when records carry no date field (the delivery schema has none)')
+    parser.add_argument('--kpi-batch-id', default=None,
+                        help='Delivery batch for kpi_cache totals; re-running a batch replaces its '
+                             'figures (default: digest of the batch global_ids)')
+    parser.add_argument('--kpi-batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='kpi_cache rows per transaction')
+    parser.add_argument('--checkpoint-every', type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                        help='Records between checkpoints (0 disables checkpointing)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue from the last checkpoint in the output directory')
     args = parser.parse_args()
 
+    if args.kpi_day and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', args.kpi_day):
+        parser.error('--kpi-day must be YYYY-MM-DD')
     if args.seed is not None:
         random.seed(args.seed)
 
-    # Detect format
-    fmt = args.format
-    if not fmt:
-        ext = os.path.splitext(args.input)[1].lower()
-        fmt = 'csv' if ext == '.csv' else 'json'
+    try:
+        files = expand_inputs(args.input)
+    except FileNotFoundError as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
 
     # Load data
-    print(f'Loading {fmt.upper()} data from: {args.input}')
-    if fmt == 'csv':
-        pois = load_csv(args.input)
-    else:
-        pois = load_json(args.input)
-
+    print(f'Loading {len(files)} input file(s): {", ".join(files)}')
+    pois, duplicates = merge_pois(load_inputs(files, args.format, args.workers), args.dedup)
     print(f'Loaded {len(pois)} POI records')
+    if duplicates['duplicate_global_ids']:
+        print(f'  {duplicates["duplicate_global_ids"]} duplicate global_id(s), '
+              f'{duplicates["dropped_records"]} record(s) dropped ({args.dedup})')
 
     if not pois:
         print('ERROR: No POI records found.')
         sys.exit(1)
 
     # Validate each POI
+    os.makedirs(args.output, exist_ok=True)
+    ckpt = RunCheckpoint(os.path.join(args.output, '.checkpoint'),
+                         input_fingerprint(files, format=args.format, dedup=args.dedup, seed=args.seed),
+                         every=args.checkpoint_every)
+    try:
+        state = ckpt.begin(args.resume, {})
+    except CheckpointError as e:
+        print(f'ERROR: cannot resume: {e}')
+        sys.exit(1)
+    results = ckpt.spilled
+    if state['next_index']:
+        print(f'Resuming from checkpoint at record {state["next_index"]}')
+
     print('Running validation...')
-    results = []
-    for idx, poi in enumerate(pois):
-        result = validate_poi(poi, idx)
+    for idx in range(state['next_index'], len(pois)):
+        result = validate_poi(pois[idx], idx)
         results.append(result)
+        ckpt.append(result)
+        if ckpt.due(idx + 1):
+            ckpt.save(idx + 1, {})
+
+    if args.registry:
+        flagged = apply_registry_check(pois, results, args.registry)
+        print(f'  {flagged} POI(s) already delivered in an earlier batch')
+    apply_compliance_scores(pois, results)
 
     # Generate reports
-    os.makedirs(args.output, exist_ok=True)
 
     # 1. Validation report
     validation_report = generate_validation_report(results)
@@ -563,7 +818,7 @@ def main():
     print(f'  Validation report: {vr_path}')
 
     # 2. KPI summary (30% QA sampling)
-    kpi_summary = qa_sample_and_calculate_kpi(results)
+    kpi_summary = qa_sample_and_calculate_kpi(results, pois, args.qa_strata, args.qa_trials, args.seed)
     kpi_path = os.path.join(args.output, 'kpi_summary.json')
     with open(kpi_path, 'w', encoding='utf-8') as f:
         json.dump(kpi_summary, f, indent=2, ensure_ascii=False)
@@ -575,12 +830,32 @@ def main():
     print(f'  Completeness report: {comp_path}')
 
     # 4. Billing summary
-    billing = calculate_billing(pois)
+    billing = calculate_billing(pois, results)
     bill_path = os.path.join(args.output, 'billing_summary.json')
     with open(bill_path, 'w', encoding='utf-8') as f:
         json.dump(billing, f, indent=2, ensure_ascii=False)
     print(f'  Billing summary: {bill_path}')
 
+    # 5. Duplicate global_id report
+    if duplicates['duplicate_global_ids']:
+        dup_path = os.path.join(args.output, 'duplicates_report.json')
+        with open(dup_path, 'w', encoding='utf-8') as f:
+            json.dump(duplicates, f, indent=2, ensure_ascii=False)
+        print(f'  Duplicates report: {dup_path}')
+
+    # 6. Grouped KPI rollups (+ kpi_cache)
+    rollups = build_kpi_rollups(pois, results, args.kpi_agent, args.kpi_day)
+    rollup_path = os.path.join(args.output, 'kpi_rollups.json')
+    with open(rollup_path, 'w', encoding='utf-8') as f:
+        json.dump(generate_rollup_report(rollups), f, indent=2, ensure_ascii=False)
+    print(f'  KPI rollups: {rollup_path}')
+    if args.kpi_db:
+        batch_id = args.kpi_batch_id or kpi_batch_id(pois)
+        n = upsert_kpi_cache(args.kpi_db, kpi_batch_rows(rollups, batch_id, args.survey_id),
+                             args.kpi_batch_size)
+        print(f'  kpi_cache: {n} row(s) upserted (batch {batch_id})')
+    ckpt.finish()
+
     # Print summary
     s = validation_report['summary']
     k = kpi_summary
@@ -593,10 +868,17 @@ def main():
     print(f'  Invalid POIs:      {s["invalid_pois"]}')
     print(f'  Overall Accuracy:  {s["accuracy_pct"]}%')
     print(f'  Avg Completeness:  {s["avg_completeness_pct"]}%')
+    print(f'  Avg Compliance:    {s["avg_compliance_score"]}% ({s["earned_sar_total"]:,.2f} SAR earned)')
     print(f'  QA Sample Size:    {k["sample_size"]} ({k["sampling_rate_pct"]}%)')
     print(f'  QA Accuracy:       {k["accuracy_pct"]}%')
     print(f'  QA Decision:       {k["decision"]}')
+    p = k['decision_probability']
+    print(f'  QA Odds:           ACCEPT {p["ACCEPT"] * 100:.2f}% · CORRECTION '
+          f'{p["REQUIRE_CORRECTION"] * 100:.2f}% · RESURVEY {p["REQUIRE_RESURVEY"] * 100:.2f}%')
     print(f'  Total Cost:        {b["subtotal_sar"]:,.2f} SAR')
+    if billing['delivery']['previously_delivered_pois']:
+        print(f'  Not Billed:        {billing["delivery"]["previously_delivered_pois"]} previously delivered POI(s)'
+              f' (left out of generate_delivery packages)')
     print(f'  Budget Remaining:  {b["remaining_budget_sar"]:,.2f} SAR')
     if b['over_budget']:
         print(f'  ⚠ OVER BUDGET by {abs(b["remaining_budget_sar"]):,.2f} SAR')
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+NAVER POI Working-Hours Parser
+===============================
+Farq Technology Establishment — NAVER Cloud Corporation
+
+Parses `working_days`, `working_hours` and `break_times` in the formats
+allowed by the data dictionary into a weekly bitmask:
+
+    bit n  →  open during slot n   (SLOT_MINUTES slots, Sunday 00:00 = slot 0)
+
+Accepted formats:
+    working_days   "All Days (7 days)", "Sunday-Thursday", "Sat, Sun, Mon",
+                   Arabic day names, or a list of day names
+    working_hours  "6 AM - 12 AM", "09:00-23:00", "9 AM - 1 PM, 4 PM - 11 PM",
+                   "24 hours", "Closed", or JSON per day {"sunday": "9:00-17:00"}
+    break_times    "No Break", "1 PM - 4 PM", or JSON per day
+
+Ranges whose end is not after their start run past midnight into the next day.
+A bare start hour takes the end's AM/PM when that keeps the range within one
+day ("1 - 2 PM" is 13:00-14:00, "9 - 5 PM" stays 09:00-17:00).
+
+Usage:
+    python working_hours.py --input data.json --open-at "friday 03:00"
+    python working_hours.py --input data.json --open-during "friday 02:00-04:30"
+    python working_hours.py --input data.json --open-during "friday 02:00-04:30" --any
+"""
+
+import argparse
+import json
+import re
+import sys
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+MINUTES_PER_DAY = 24 * 60
+FULL_WEEK = (1 << SLOTS_PER_WEEK) - 1
+
+DAYS = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+
+DAY_ALIASES = {
+    **{d: i for i, d in enumerate(DAYS)},
+    **{d[:3]: i for i, d in enumerate(DAYS)},
+    'tues': 2, 'weds': 3, 'thur': 4, 'thurs': 4,
+    'الأحد': 0, 'الاحد': 0, 'الاثنين': 1, 'الإثنين': 1, 'الثلاثاء': 2,
+    'الأربعاء': 3, 'الاربعاء': 3, 'الخميس': 4, 'الجمعة': 5, 'السبت': 6,
+}
+
+ALL_DAYS_PHRASES = (
+    'all days', 'all day', 'everyday', 'every day', 'daily', '7 days',
+    'all week', 'whole week', 'كل الأيام', 'كل الايام', 'يوميا', 'يومياً',
+)
+FULL_DAY_PHRASES = ('24 hours', '24 hrs', '24h', '24/7', 'open 24 hours', 'all day', '24 ساعة')
+CLOSED_PHRASES = ('closed', 'off', 'مغلق')
+NO_BREAK_PHRASES = ('no break', 'no breaks', 'without break', 'no', 'لا يوجد')
+NO_VALUE = ('', 'n/a', 'na', '--', 'null', 'none')
+
+_LIST_SPLIT = re.compile(r'\s*(?:,|،|;|&|\band\b)\s*')
+_RANGE_SPLIT = re.compile(r'\s*(?:-|–|—|\bto\b|\buntil\b|إلى|الى)\s*')
+_TIME = re.compile(r'^(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.|ص|م)?$')
+
+
+class ScheduleError(ValueError):
+    """Raised when a schedule value cannot be parsed."""
+
+
+def _blank(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in NO_VALUE
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIELD PARSERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _parse_day(token: str) -> int:
+    day = DAY_ALIASES.get(token.strip().lower().rstrip('.'))
+    if day is None:
+        raise ScheduleError(token)
+    return day
+
+
+def parse_days(value) -> set:
+    """Parse a working_days value into a set of day indexes (Sunday = 0)."""
+    if isinstance(value, list):
+        return set().union(*(parse_days(v) for v in value)) if value else set()
+    if not isinstance(value, str):
+        raise ScheduleError(value)
+    text = re.sub(r'\(.*?\)', '', value).strip().lower()
+    if text in ALL_DAYS_PHRASES:
+        return set(range(7))
+    days = set()
+    for part in filter(None, _LIST_SPLIT.split(text)):
+        bounds = _RANGE_SPLIT.split(part)
+        if len(bounds) == 1:
+            days.add(_parse_day(bounds[0]))
+        elif len(bounds) == 2:
+            start, end = _parse_day(bounds[0]), _parse_day(bounds[1])
+            days.update((start + i) % 7 for i in range((end - start) % 7 + 1))
+        else:
+            raise ScheduleError(part)
+    if not days:
+        raise ScheduleError(value)
+    return days
+
+
+def parse_time(token: str) -> int:
+    """Parse a clock time ("6 AM", "18:30", "noon") into minutes after midnight."""
+    text = token.strip().lower()
+    if text in ('midnight', 'منتصف الليل'):
+        return 0
+    if text in ('noon', 'midday', 'الظهر'):
+        return 12 * 60
+    m = _TIME.match(text)
+    if not m:
+        raise ScheduleError(token)
+    hour, minute, meridiem = int(m.group(1)), int(m.group(2) or 0), m.group(3)
+    if minute >= 60:
+        raise ScheduleError(token)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ScheduleError(token)
+        hour %= 12
+        if meridiem in ('pm', 'p.m.', 'م'):
+            hour += 12
+    elif hour > 24 or (hour == 24 and minute):
+        raise ScheduleError(token)
+    return hour * 60 + minute
+
+
+def _carry_meridiem(start_token: str, end_token: str, end: int):
+    """Start time read with the end's AM/PM, or None if that does not apply."""
+    start_m = _TIME.match(start_token.strip().lower())
+    end_m = _TIME.match(end_token.strip().lower())
+    if not (start_m and end_m and end_m.group(3)) or start_m.group(3):
+        return None
+    if not 1 <= int(start_m.group(1)) <= 12:
+        return None
+    start = parse_time(f'{start_token.strip()} {end_m.group(3)}')
+    return start if start < end else None
+
+
+def parse_ranges(value) -> list:
+    """
+    Parse an hours value into [(start_min, end_min), ...] for one day.
+    End may exceed 1440 when a range runs past midnight.
+    """
+    if isinstance(value, list):
+        return [r for v in value for r in parse_ranges(v)]
+    if not isinstance(value, str):
+        raise ScheduleError(value)
+    text = value.strip().lower()
+    if text in FULL_DAY_PHRASES:
+        return [(0, MINUTES_PER_DAY)]
+    if text in CLOSED_PHRASES:
+        return []
+    ranges = []
+    for part in filter(None, _LIST_SPLIT.split(text)):
+        bounds = _RANGE_SPLIT.split(part)
+        if len(bounds) != 2:
+            raise ScheduleError(part)
+        start, end = parse_time(bounds[0]), parse_time(bounds[1])
+        carried = _carry_meridiem(bounds[0], bounds[1], end)
+        if carried is not None:
+            start = carried
+        if end <= start:
+            end += MINUTES_PER_DAY
+        ranges.append((start, end))
+    if not ranges:
+        raise ScheduleError(value)
+    return ranges
+
+
+def _decode(value):
+    """Decode a JSON-per-day schedule flattened to a string by the CSV export."""
+    if isinstance(value, str) and value.lstrip().startswith('{'):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ScheduleError(value)
+    return value
+
+
+def _per_day(value, days: set) -> dict:
+    """Expand an hours value into {day: ranges} for the given open days."""
+    value = _decode(value)
+    if isinstance(value, dict):
+        per_day = {}
+        for key, hours in value.items():
+            for day in parse_days(key):
+                per_day[day] = [] if _blank(hours) else parse_ranges(hours)
+        return per_day
+    ranges = parse_ranges(value)
+    return {day: ranges for day in days}
+
+
+def _within(start: int, end: int, ranges: list) -> bool:
+    return any(s <= start and end <= e for s, e in ranges)
+
+
+def align_breaks(breaks: dict, hours: dict) -> dict:
+    """
+    Move each break that falls in the past-midnight part of its day's shift
+    onto that part, e.g. "1 AM - 1:30 AM" under Friday "10 PM - 2 AM" becomes
+    Friday 25:00-25:30 (Saturday 01:00) rather than Friday 01:00.
+    """
+    aligned = {}
+    for day, ranges in breaks.items():
+        shifts = hours.get(day, [])
+        aligned[day] = [
+            (start + MINUTES_PER_DAY, end + MINUTES_PER_DAY)
+            if not _within(start, end, shifts)
+            and _within(start + MINUTES_PER_DAY, end + MINUTES_PER_DAY, shifts)
+            else (start, end)
+            for start, end in ranges
+        ]
+    return aligned
+
+
+def ranges_to_mask(per_day: dict) -> int:
+    """Convert {day: [(start_min, end_min)]} into a weekly slot bitmask."""
+    mask = 0
+    for day, ranges in per_day.items():
+        for start, end in ranges:
+            first = day * SLOTS_PER_DAY + start // SLOT_MINUTES
+            count = min(-(-end // SLOT_MINUTES) - start // SLOT_MINUTES, SLOTS_PER_WEEK)
+            span = ((1 << count) - 1) << first
+            mask |= (span | (span >> SLOTS_PER_WEEK)) & FULL_WEEK
+    return mask
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POI SCHEDULE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_poi_schedule(poi: dict):
+    """
+    Parse a POI's schedule fields.
+    Returns (weekly_mask or None, errors) using validation error codes.
+    """
+    errors = []
+    days = set(range(7))
+    wd = poi.get('working_days')
+    if not _blank(wd):
+        try:
+            days = parse_days(wd)
+        except ScheduleError:
+            errors.append(f'working_days_unparseable: "{wd}"')
+
+    wh = poi.get('working_hours')
+    if _blank(wh):
+        return None, errors
+    try:
+        hours = _per_day(wh, days)
+    except ScheduleError:
+        errors.append(f'working_hours_unparseable: "{wh}"')
+        return None, errors
+    if isinstance(_decode(wh), dict) and not errors and not _blank(wd):
+        open_days = {d for d, r in hours.items() if r}
+        if open_days != days:
+            errors.append('working_days_hours_mismatch')
+    mask = ranges_to_mask(hours)
+
+    bt = poi.get('break_times')
+    if not _blank(bt) and not (isinstance(bt, str) and bt.strip().lower() in NO_BREAK_PHRASES):
+        try:
+            breaks = ranges_to_mask(align_breaks(_per_day(bt, days), hours))
+        except ScheduleError:
+            errors.append(f'break_times_unparseable: "{bt}"')
+        else:
+            if breaks & ~mask:
+                errors.append('break_outside_working_hours')
+            mask &= ~breaks
+
+    if errors:
+        return None, errors
+    return mask, errors
+
+
+def parse_slot(text: str) -> int:
+    """Parse "friday 03:00" into a weekly slot number."""
+    day, _, clock = text.strip().partition(' ')
+    return _parse_day(day) * SLOTS_PER_DAY + parse_time(clock) // SLOT_MINUTES
+
+
+def parse_window(text: str) -> int:
+    """Parse "friday 02:00-04:30" into a weekly slot bitmask."""
+    day, _, clock = text.strip().partition(' ')
+    return ranges_to_mask({_parse_day(day): parse_ranges(clock)})
+
+
+class ScheduleIndex:
+    """
+    Bulk open-at queries over a dataset. POIs are grouped by distinct weekly
+    mask, so each query tests every distinct schedule once rather than every POI.
+    """
+
+    def __init__(self, pois: list):
+        self.groups = {}
+        self.unparsed = []
+        for i, poi in enumerate(pois):
+            mask, _ = parse_poi_schedule(poi)
+            poi_id = str(poi.get('global_id', f'ROW_{i}'))
+            if mask is None:
+                self.unparsed.append(poi_id)
+            else:
+                self.groups.setdefault(mask, []).append(poi_id)
+
+    def _select(self, test) -> list:
+        return [pid for mask, ids in self.groups.items() if test(mask) for pid in ids]
+
+    def open_at(self, slot: int) -> list:
+        """POI ids open during weekly `slot`."""
+        return self._select(lambda m: m >> slot & 1)
+
+    def open_during(self, window: int, any_time: bool = False) -> list:
+        """POI ids open for the whole window mask (or any part of it)."""
+        if any_time:
+            return self._select(lambda m: m & window)
+        return self._select(lambda m: m & window == window)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    from validate import load_csv, load_json
+
+    parser = argparse.ArgumentParser(description='NAVER POI Working-Hours Query')
+    parser.add_argument('--input', '-i', required=True, help='Input data file (JSON or CSV)')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--open-at', help='Day and time, e.g. "friday 03:00"')
+    query.add_argument('--open-during', help='Day and window, e.g. "friday 02:00-04:30"')
+    parser.add_argument('--any', action='store_true',
+                        help='With --open-during, match POIs open for any part of the window')
+    args = parser.parse_args()
+
+    pois = load_csv(args.input) if args.input.lower().endswith('.csv') else load_json(args.input)
+    index = ScheduleIndex(pois)
+    try:
+        if args.open_at:
+            ids = index.open_at(parse_slot(args.open_at))
+        else:
+            ids = index.open_during(parse_window(args.open_during), args.any)
+    except ScheduleError as e:
+        parser.error(f'cannot parse query: {e}')
+
+    json.dump({
+        'total_pois': len(pois),
+        'unparsed_schedules': len(index.unparsed),
+        'matching_pois': len(ids),
+        'poi_ids': ids,
+    }, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()